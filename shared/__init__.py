@@ -13,6 +13,7 @@ from .title_utils import (
 from .analysis_utils import (
     SECTION_ICONS,
     REQUIRED_ANALYSIS_SECTIONS,
+    REQUIRED_AUDIO_ANALYSIS_SECTIONS,
     get_section_icon,
     parse_gemini_analysis,
     validate_analysis_sections,
@@ -32,6 +33,7 @@ __all__ = [
     # Analysis utilities
     'SECTION_ICONS',
     'REQUIRED_ANALYSIS_SECTIONS',
+    'REQUIRED_AUDIO_ANALYSIS_SECTIONS',
     'get_section_icon',
     'parse_gemini_analysis',
     'validate_analysis_sections',
@@ -29,6 +29,23 @@ REQUIRED_ANALYSIS_SECTIONS = [
     'Content Category',
 ]
 
+# Required sections when the source is audio-only (Spotify podcasts fetched
+# as MP3): there is no picture, so visual and production sections are dropped
+REQUIRED_AUDIO_ANALYSIS_SECTIONS = [
+    'Audio Content',
+    'Mood & Tone',
+    'Key Messages',
+    'Content Category',
+]
+
+# Emoji ranges (plus variation selectors) stripped from the start of section names
+_ICON_PREFIX_RE = re.compile(
+    r'^[\U0001F300-\U0001F9FF\U00002600-\U000027BF\uFE00-\uFE0F\U0001F1E0-\U0001F1FF\s]+'
+)
+_NUMBERED_HEADER_RE = re.compile(r'^\d+\.\s*\*\*([^*]+)\*\*[:\s]*(.*?)$')
+_MARKDOWN_HEADING_RE = re.compile(r'^##\s*(.+?)\s*$')
+_WORD_RE = re.compile(r'\w+')
+
 
 def get_section_icon(section_name: str) -> str:
     """Get the icon for a section name."""
@@ -43,10 +60,7 @@ def _strip_icon(text: str) -> str:
         return text
     # Strip leading emoji (including variation selectors like \ufe0f) and whitespace
     # Emoji ranges: various emoji blocks + variation selectors
-    cleaned = re.sub(
-        r'^[\U0001F300-\U0001F9FF\U00002600-\U000027BF\uFE00-\uFE0F\U0001F1E0-\U0001F1FF\s]+',
-        '', text
-    )
+    cleaned = _ICON_PREFIX_RE.sub('', text)
     return cleaned.strip()
 
 
@@ -82,10 +96,7 @@ def parse_gemini_analysis(analysis_text: str) -> Dict[str, str]:
         # - "1. **👁️ Visual Content**" (new format, content on next line)
         # - "1. **Visual Content**: content here" (legacy format, content on same line)
         # - "1. **Visual Content**:" (legacy format, content on next line)
-        header_match = re.match(
-            r'^\d+\.\s*\*\*([^*]+)\*\*[:\s]*(.*?)$',
-            line.strip()
-        )
+        header_match = _NUMBERED_HEADER_RE.match(line.strip())
 
         if header_match:
             # Save previous section
@@ -106,7 +117,7 @@ def parse_gemini_analysis(analysis_text: str) -> Dict[str, str]:
     # If no sections found, try ## heading format
     if not sections:
         for line in lines:
-            heading_match = re.match(r'^##\s*(.+?)\s*$', line.strip())
+            heading_match = _MARKDOWN_HEADING_RE.match(line.strip())
             if heading_match:
                 if current_section:
                     sections[current_section] = '\n'.join(current_content).strip()
@@ -166,6 +177,14 @@ def validate_analysis_sections(
     sections = parse_gemini_analysis(analysis_text)
     result['sections'] = sections
 
+    # Build case-insensitive and word-set lookups once instead of rescanning
+    # every parsed section for each required one (first match wins)
+    by_lower = {}
+    by_words = {}
+    for key, value in sections.items():
+        by_lower.setdefault(key.lower(), value)
+        by_words.setdefault(frozenset(_WORD_RE.findall(key.lower())), value)
+
     # Check for each required section
     for section_name in required_sections:
         # Try exact match first
@@ -173,19 +192,11 @@ def validate_analysis_sections(
 
         # Try case-insensitive match
         if content is None:
-            for key, value in sections.items():
-                if key.lower() == section_name.lower():
-                    content = value
-                    break
+            content = by_lower.get(section_name.lower())
 
         # Try partial match (e.g., "Mood & Tone" matches "Mood and Tone")
         if content is None:
-            section_words = set(re.findall(r'\w+', section_name.lower()))
-            for key, value in sections.items():
-                key_words = set(re.findall(r'\w+', key.lower()))
-                if section_words == key_words:
-                    content = value
-                    break
+            content = by_words.get(frozenset(_WORD_RE.findall(section_name.lower())))
 
         if content is None:
             result['missing'].append(section_name)
@@ -234,7 +245,7 @@ def validate_transcription(transcription_result: Optional[Dict]) -> Dict:
     return result
 
 
-def validate_video_enrichment(response: Dict) -> Dict:
+def validate_video_enrichment(response: Dict, required_sections: List[str] = None) -> Dict:
     """
     Validate complete video enrichment response.
 
@@ -245,6 +256,7 @@ def validate_video_enrichment(response: Dict) -> Dict:
 
     Args:
         response: Full response from video enricher
+        required_sections: Analysis sections to require (uses defaults if None)
 
     Returns:
         Dict with:
@@ -268,7 +280,7 @@ def validate_video_enrichment(response: Dict) -> Dict:
             result['valid'] = False
             result['errors'].append(f"Gemini analysis error: {gemini_result['error']}")
         else:
-            analysis_validation = validate_analysis_sections(analysis_text)
+            analysis_validation = validate_analysis_sections(analysis_text, required_sections)
             result['analysis_validation'] = analysis_validation
             if not analysis_validation['valid']:
                 result['valid'] = False
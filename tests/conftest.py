@@ -6,7 +6,7 @@ import pytest
 import sys
 import importlib.util
 from pathlib import Path
-from bs4 import BeautifulSoup
+import lxml.html
 
 # Project root for finding Cloud Function modules
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -44,9 +44,9 @@ def extract_spotify_episode_id():
 
 
 @pytest.fixture
-def calculate_reading_time():
-    """Returns calculate_reading_time function from webpage-enricher."""
-    return _webpage_enricher_module.calculate_reading_time
+def reading_time_for_words():
+    """Returns reading_time_for_words function from webpage-enricher."""
+    return _webpage_enricher_module.reading_time_for_words
 
 
 @pytest.fixture
@@ -61,6 +61,12 @@ def extract_metadata():
     return _webpage_enricher_module.extract_metadata
 
 
+@pytest.fixture
+def extract_main_content():
+    """Returns extract_main_content function from webpage-enricher."""
+    return _webpage_enricher_module.extract_main_content
+
+
 @pytest.fixture
 def extract_price():
     """Returns extract_price function from webpage-enricher."""
@@ -89,9 +95,33 @@ def generate_smart_filename():
     return _video_enricher_module.generate_smart_filename
 
 
+@pytest.fixture
+def get_cached_youtube_url():
+    """Returns get_cached_youtube_url function from video-enricher."""
+    return _video_enricher_module.get_cached_youtube_url
+
+
+@pytest.fixture
+def cache_youtube_url():
+    """Returns cache_youtube_url function from video-enricher."""
+    return _video_enricher_module.cache_youtube_url
+
+
+@pytest.fixture
+def extract_audio_to_gcs():
+    """Returns extract_audio_to_gcs function from video-enricher."""
+    return _video_enricher_module.extract_audio_to_gcs
+
+
+@pytest.fixture
+def analyze_video_with_gemini():
+    """Returns analyze_video_with_gemini function from video-enricher."""
+    return _video_enricher_module.analyze_video_with_gemini
+
+
 @pytest.fixture
 def sample_article_html():
-    """Returns BeautifulSoup of a sample article page."""
+    """Returns the parsed lxml tree of a sample article page."""
     html = """
     <!DOCTYPE html>
     <html>
@@ -111,12 +141,12 @@ def sample_article_html():
     </body>
     </html>
     """
-    return BeautifulSoup(html, 'html.parser')
+    return lxml.html.document_fromstring(html)
 
 
 @pytest.fixture
 def sample_product_html():
-    """Returns BeautifulSoup of a sample product page."""
+    """Returns the parsed lxml tree of a sample product page."""
     html = """
     <!DOCTYPE html>
     <html>
@@ -132,12 +162,12 @@ def sample_product_html():
     </body>
     </html>
     """
-    return BeautifulSoup(html, 'html.parser')
+    return lxml.html.document_fromstring(html)
 
 
 @pytest.fixture
 def sample_code_html():
-    """Returns BeautifulSoup of a page with code snippets."""
+    """Returns the parsed lxml tree of a page with code snippets."""
     html = """
     <!DOCTYPE html>
     <html>
@@ -157,22 +187,23 @@ def sample_code_html():
     </body>
     </html>
     """
-    return BeautifulSoup(html, 'html.parser')
+    return lxml.html.document_fromstring(html)
 
 
 @pytest.fixture
-def empty_soup():
-    """Returns empty BeautifulSoup."""
-    return BeautifulSoup("", 'html.parser')
+def empty_tree():
+    """Returns the lxml tree of an empty page."""
+    return lxml.html.document_fromstring("<html></html>")
 
 
 @pytest.fixture
 def mock_flask_request():
     """Factory for creating mock Flask request objects."""
     class MockRequest:
-        def __init__(self, json_data=None, method='POST'):
+        def __init__(self, json_data=None, method='POST', headers=None):
             self._json = json_data or {}
             self.method = method
+            self.headers = headers or {}
             self.data = b''
 
         def get_json(self, force=False, silent=False):
@@ -223,6 +254,18 @@ def fetch_spotify_episode():
     return _webpage_enricher_module.fetch_spotify_episode
 
 
+@pytest.fixture
+def find_episode_in_rss():
+    """Returns find_episode_in_rss function from webpage-enricher."""
+    return _webpage_enricher_module.find_episode_in_rss
+
+
+@pytest.fixture
+def fetch_video_oembed():
+    """Returns fetch_video_oembed function from webpage-enricher."""
+    return _webpage_enricher_module.fetch_video_oembed
+
+
 @pytest.fixture
 def enrich_webpage():
     """Returns main entry point from webpage-enricher."""
@@ -232,4 +275,4 @@ def enrich_webpage():
 @pytest.fixture
 def enrich_video():
     """Returns main entry point from video-enricher."""
-    return _video_enricher_module.enrich_video
+    return _video_enricher_module.download_and_store
@@ -12,6 +12,24 @@ from unittest.mock import patch, MagicMock
 class TestFetchWebpage:
     """Tests for fetch_webpage() with mocked HTTP responses."""
 
+    @responses.activate
+    def test_cookies_not_kept_between_fetches(self, fetch_webpage):
+        """Cookies set by one bookmarked site aren't stored on the shared session."""
+        from tests.conftest import _webpage_enricher_module as module
+        test_url = "https://example.com/article"
+        responses.add(
+            responses.GET,
+            test_url,
+            body="<html><body><p>Hi</p></body></html>",
+            status=200,
+            content_type="text/html",
+            headers={"Set-Cookie": "consent=yes; Path=/"},
+        )
+
+        fetch_webpage(test_url)
+
+        assert len(module._SESSION.cookies) == 0
+
     @responses.activate
     def test_success_returns_html(self, fetch_webpage):
         """Successful fetch returns HTML content."""
@@ -30,6 +48,45 @@ class TestFetchWebpage:
         assert html == test_html
         assert error is None
 
+    @responses.activate
+    def test_large_page_is_truncated(self, fetch_webpage):
+        """Only the first MAX_HTML_BYTES of a page are downloaded."""
+        from tests.conftest import _webpage_enricher_module
+        test_url = "https://example.com/huge"
+        test_html = "<html><body>" + "<p>lorem ipsum</p>" * 200000 + "</body></html>"
+
+        responses.add(
+            responses.GET,
+            test_url,
+            body=test_html,
+            status=200,
+            content_type="text/html; charset=utf-8"
+        )
+
+        html, error = fetch_webpage(test_url)
+        assert error is None
+        assert html.startswith("<html><body><p>lorem ipsum</p>")
+        assert len(html.encode('utf-8')) <= _webpage_enricher_module.MAX_HTML_BYTES
+        assert html.endswith(">")
+
+    @responses.activate
+    def test_undeclared_charset_decoded_as_utf8(self, fetch_webpage):
+        """Pages without a declared charset are decoded as UTF-8."""
+        test_url = "https://example.com/utf8"
+        test_html = "<html><body><h1>Café – naïve</h1></body></html>"
+
+        responses.add(
+            responses.GET,
+            test_url,
+            body=test_html.encode('utf-8'),
+            status=200,
+            content_type="text/html"
+        )
+
+        html, error = fetch_webpage(test_url)
+        assert html == test_html
+        assert error is None
+
     @responses.activate
     def test_404_returns_error(self, fetch_webpage):
         """404 response returns error tuple."""
@@ -191,6 +248,37 @@ class TestFetchSpotifyEpisode:
         assert result['title'] == "Test Episode"
         assert result['show_name'] == "Test Podcast"
 
+    @responses.activate
+    def test_repeat_fetch_served_from_cache(self, fetch_spotify_episode):
+        """Second fetch of the same episode does not hit the Spotify API."""
+        episode_id = "cachedEpisode123"
+        episode_url = f"https://open.spotify.com/episode/{episode_id}"
+
+        responses.add(
+            responses.POST,
+            "https://accounts.spotify.com/api/token",
+            json={"access_token": "test_token", "expires_in": 3600},
+            status=200
+        )
+        episode_mock = responses.add(
+            responses.GET,
+            f"https://api.spotify.com/v1/episodes/{episode_id}",
+            json={"name": "Cached Episode", "show": {"name": "Cached Podcast"}},
+            status=200
+        )
+
+        from tests.conftest import _webpage_enricher_module
+        _webpage_enricher_module._spotify_token_cache['token'] = None
+        _webpage_enricher_module._spotify_token_cache['expires_at'] = 0
+        _webpage_enricher_module._spotify_episode_cache.clear()
+        _webpage_enricher_module.SPOTIFY_CLIENT_ID = 'test_id'
+        _webpage_enricher_module.SPOTIFY_CLIENT_SECRET = 'test_secret'
+
+        first = fetch_spotify_episode(episode_url)
+        second = fetch_spotify_episode(f"{episode_url}?si=share")
+        assert first['title'] == second['title'] == "Cached Episode"
+        assert episode_mock.call_count == 1
+
     def test_invalid_url_returns_error(self, fetch_spotify_episode):
         """Invalid URL returns error."""
         result = fetch_spotify_episode("https://youtube.com/watch?v=abc")
@@ -254,3 +342,364 @@ class TestFetchSpotifyEpisode:
         result = fetch_spotify_episode(episode_url)
         # Should get some result from oEmbed fallback
         assert 'title' in result or 'error' in result
+
+
+class TestFetchVideoOembed:
+    """Tests for fetch_video_oembed() with mocked oEmbed responses."""
+
+    @responses.activate
+    def test_vimeo_oembed(self, fetch_video_oembed):
+        """Vimeo URLs resolve through the Vimeo oEmbed endpoint."""
+        responses.add(
+            responses.GET,
+            "https://vimeo.com/api/oembed.json",
+            json={
+                "title": "Test Video",
+                "author_name": "Test Channel",
+                "thumbnail_url": "https://i.vimeocdn.com/video/1.jpg",
+                "description": "About the video",
+                "upload_date": "2024-05-01 10:04:03",
+            },
+            status=200
+        )
+
+        result = fetch_video_oembed("https://vimeo.com/123", "vimeo.com")
+        assert result['success'] is True
+        assert result['title'] == "Test Video"
+        assert result['description'] == "About the video"
+
+    @responses.activate
+    def test_oembed_error(self, fetch_video_oembed):
+        """A failed oEmbed lookup reports failure so the caller can fall back."""
+        responses.add(
+            responses.GET,
+            "https://vimeo.com/api/oembed.json",
+            status=404
+        )
+
+        result = fetch_video_oembed("https://vimeo.com/123", "vimeo.com")
+        assert result['success'] is False
+
+    def test_unsupported_domain(self, fetch_video_oembed):
+        result = fetch_video_oembed("https://www.youtube.com/watch?v=abc", "www.youtube.com")
+        assert result['success'] is False
+
+
+class TestEnrichWebpageOembed:
+    """Tests for the oEmbed shortcut in enrich_webpage()."""
+
+    @responses.activate
+    def test_vimeo_served_from_oembed(self, enrich_webpage, mock_flask_request):
+        """Vimeo oEmbed carries description and date, so the page isn't fetched."""
+        import json
+        responses.add(
+            responses.GET,
+            "https://vimeo.com/api/oembed.json",
+            json={
+                "title": "Test Video",
+                "author_name": "Test Channel",
+                "thumbnail_url": "https://i.vimeocdn.com/video/1.jpg",
+                "description": "About the video",
+                "upload_date": "2024-05-01 10:04:03",
+            },
+            status=200
+        )
+
+        request = mock_flask_request(json_data={'url': "https://vimeo.com/123", 'options': {'skip_ai': True}})
+        body, status, _ = enrich_webpage(request)
+
+        assert status == 200
+        assert len(responses.calls) == 1
+        data = json.loads(body)
+        assert data['type'] == 'video'
+        assert data['description'] == "About the video"
+        assert data['published_date'] == "2024-05-01"
+
+    @responses.activate
+    def test_youtube_keeps_page_description(self, enrich_webpage, mock_flask_request):
+        """YouTube oEmbed has no description, so the page is parsed instead."""
+        import json
+        test_url = "https://www.youtube.com/watch?v=abc"
+        html = ('<html><head><title>Test Video</title>'
+                '<meta property="og:description" content="About the video"></head><body></body></html>')
+        responses.add(responses.GET, test_url, body=html, status=200, content_type="text/html; charset=utf-8")
+
+        request = mock_flask_request(json_data={'url': test_url, 'options': {'skip_ai': True}})
+        body, status, _ = enrich_webpage(request)
+
+        assert status == 200
+        data = json.loads(body)
+        assert data['type'] == 'video'
+        assert data['title'] == "Test Video"
+        assert data['description'] == "About the video"
+
+
+class TestFindEpisodeInRss:
+    """Tests for find_episode_in_rss() with a mocked RSS feed."""
+
+    RSS_URL = "https://feeds.example.com/podcast.xml"
+    FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+  <channel>
+    <title>Tech Talk Podcast</title>
+    <item>
+      <title>Episode 12: Rust for Beginners</title>
+      <enclosure url="https://cdn.example.com/ep12.mp3" type="audio/mpeg" length="1"/>
+      <itunes:duration>45:00</itunes:duration>
+    </item>
+    <item>
+      <title>The Future of AI</title>
+      <enclosure url="https://cdn.example.com/ep11.mp3" type="audio/mpeg" length="1"/>
+      <itunes:duration>01:00:00</itunes:duration>
+    </item>
+    <item>
+      <title>Bonus: Listener Questions</title>
+      <enclosure url="https://cdn.example.com/bonus.jpg" type="image/jpeg" length="1"/>
+      <itunes:duration>600</itunes:duration>
+    </item>
+  </channel>
+</rss>"""
+
+    @responses.activate
+    def test_finds_matching_episode(self, find_episode_in_rss):
+        responses.add(responses.GET, self.RSS_URL, body=self.FEED, status=200,
+                      content_type="application/rss+xml")
+
+        result = find_episode_in_rss(self.RSS_URL, "The Future of AI", duration_minutes=60)
+        assert result['success'] is True
+        assert result['audio_url'] == "https://cdn.example.com/ep11.mp3"
+        assert result['episode_title'] == "The Future of AI"
+
+    @responses.activate
+    def test_no_matching_episode(self, find_episode_in_rss):
+        responses.add(responses.GET, self.RSS_URL, body=self.FEED, status=200,
+                      content_type="application/rss+xml")
+
+        result = find_episode_in_rss(self.RSS_URL, "Completely unrelated quantum cooking show")
+        assert result['success'] is False
+
+    @responses.activate
+    def test_match_without_audio_enclosure(self, find_episode_in_rss):
+        responses.add(responses.GET, self.RSS_URL, body=self.FEED, status=200,
+                      content_type="application/rss+xml")
+
+        result = find_episode_in_rss(self.RSS_URL, "Bonus: Listener Questions")
+        assert result['success'] is False
+        assert 'audio' in result['error'].lower()
+
+    @responses.activate
+    def test_empty_feed(self, find_episode_in_rss):
+        responses.add(responses.GET, self.RSS_URL, status=200, content_type="application/rss+xml",
+                      body='<?xml version="1.0"?><rss version="2.0"><channel></channel></rss>')
+
+        result = find_episode_in_rss(self.RSS_URL, "The Future of AI")
+        assert result['success'] is False
+
+
+class TestEnrichWebpageCache:
+    """Tests for the enrichment result cache in enrich_webpage()."""
+
+    @responses.activate
+    def test_unchanged_page_served_from_cache(self, enrich_webpage, mock_flask_request):
+        """A second request for an unchanged page skips parsing."""
+        from tests.conftest import _webpage_enricher_module
+        _webpage_enricher_module._enrichment_cache.clear()
+        test_url = "https://example.com/cached-article"
+
+        responses.add(
+            responses.GET,
+            test_url,
+            body="<html><head><title>Cached</title></head><body><p>Body</p></body></html>",
+            status=200,
+            content_type="text/html; charset=utf-8"
+        )
+
+        request = mock_flask_request(json_data={'url': test_url, 'options': {'skip_ai': True}})
+        first, status, _ = enrich_webpage(request)
+        assert status == 200
+
+        with patch.object(_webpage_enricher_module, 'parse_html') as mock_parse:
+            second, status, _ = enrich_webpage(request)
+            mock_parse.assert_not_called()
+
+        assert status == 200
+        import json
+        assert json.loads(second)['title'] == json.loads(first)['title'] == "Cached"
+        assert json.loads(second)['processed_at'].endswith('Z')
+
+
+class TestGenerateAiAnalysis:
+    """Tests for generate_ai_analysis() with a mocked Gemini model."""
+
+    def test_long_content_truncated_at_word_boundary(self):
+        from tests.conftest import _webpage_enricher_module as module
+        model = MagicMock()
+        model.generate_content.return_value.text = '{"title": "T", "summary": "S", "analysis": "A"}'
+        content = "word " * (module.MAX_AI_CHARS // 5 + 100)
+
+        with patch.object(module, 'GEMINI_API_KEY', 'test-key'), \
+                patch.object(module, '_get_gemini_model', return_value=model):
+            result = module.generate_ai_analysis("https://example.com", "Title", content, "article")
+
+        assert result['summary'] == "S"
+        prompt = model.generate_content.call_args[0][0]
+        page_text = prompt.split("Page Content:\n", 1)[1].split("\n\nRespond", 1)[0]
+        assert len(page_text) <= module.MAX_AI_CHARS
+        assert page_text.endswith("word")
+
+
+class TestEnrichWebpageCompression:
+    """Tests for gzip-compressed enrich_webpage() responses."""
+
+    @responses.activate
+    def test_large_response_gzipped_when_accepted(self, enrich_webpage, mock_flask_request):
+        import gzip
+        import json
+        test_url = "https://example.com/long-description"
+        description = "A long description. " * 100
+
+        responses.add(
+            responses.GET,
+            test_url,
+            body=f'<html><head><meta name="description" content="{description}"></head><body></body></html>',
+            status=200,
+            content_type="text/html; charset=utf-8"
+        )
+
+        request = mock_flask_request(
+            json_data={'url': test_url, 'options': {'skip_ai': True}},
+            headers={'Accept-Encoding': 'gzip, deflate'}
+        )
+        body, status, headers = enrich_webpage(request)
+
+        assert status == 200
+        assert headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(body))['description'] == description
+
+    def test_small_response_not_gzipped(self, enrich_webpage, mock_flask_request):
+        request = mock_flask_request(json_data={}, headers={'Accept-Encoding': 'gzip'})
+        body, status, headers = enrich_webpage(request)
+
+        assert status == 400
+        assert 'Content-Encoding' not in headers
+
+
+class TestEnrichWebpageBatch:
+    """Tests for batch {"urls": [...]} requests to enrich_webpage()."""
+
+    @responses.activate
+    def test_results_returned_in_input_order(self, enrich_webpage, mock_flask_request):
+        import json
+        for n in (1, 2):
+            responses.add(
+                responses.GET,
+                f"https://example.com/batch-{n}",
+                body=f"<html><head><title>Page {n}</title></head><body><p>Body</p></body></html>",
+                status=200,
+                content_type="text/html; charset=utf-8"
+            )
+        responses.add(responses.GET, "https://example.com/batch-missing", status=404)
+
+        request = mock_flask_request(json_data={
+            'urls': ["https://example.com/batch-1", "https://example.com/batch-missing", "https://example.com/batch-2"],
+            'options': {'skip_ai': True},
+        })
+        body, status, _ = enrich_webpage(request)
+
+        assert status == 200
+        results = json.loads(body)['results']
+        assert [r['url'] for r in results] == [
+            "https://example.com/batch-1", "https://example.com/batch-missing", "https://example.com/batch-2"
+        ]
+        assert results[0]['title'] == "Page 1"
+        assert results[1]['error']['stage'] == 'fetch'
+        assert results[2]['title'] == "Page 2"
+
+    @pytest.mark.parametrize('urls', [[], "https://example.com", [123], ["https://example.com"] * 21])
+    def test_invalid_urls_rejected(self, enrich_webpage, mock_flask_request, urls):
+        request = mock_flask_request(json_data={'urls': urls})
+        body, status, _ = enrich_webpage(request)
+        assert status == 400
+
+
+class TestEnrichWebpageMetadataFallbacks:
+    """Tests for <body> metadata fallbacks in enrich_webpage()."""
+
+    @responses.activate
+    def test_body_fallbacks_used_when_head_lacks_metadata(self, enrich_webpage, mock_flask_request):
+        import json
+        test_url = "https://github.com/example/repo"
+        html = ('<html><head><title>example/repo</title></head>'
+                '<body><a rel="author">octo</a><time datetime="2024-05-01">May 1</time></body></html>')
+
+        responses.add(responses.GET, test_url, body=html, status=200, content_type="text/html; charset=utf-8")
+
+        request = mock_flask_request(json_data={
+            'url': test_url, 'options': {'skip_ai': True, 'extract_code': False}
+        })
+        body, status, _ = enrich_webpage(request)
+
+        assert status == 200
+        data = json.loads(body)
+        assert data['author'] == 'octo'
+        assert data['published_date'] == '2024-05-01'
+
+
+class TestDownloadAndStoreErrors:
+    """Tests for download_and_store() error handling with mocked downloads."""
+
+    def test_upload_failure_does_not_wait_for_gemini(self, enrich_video, mock_flask_request):
+        """A failed upload returns without waiting on the in-flight Gemini analysis."""
+        import threading
+        import time
+        from tests.conftest import _video_enricher_module as module
+
+        release = threading.Event()
+        video_info = {
+            'filepath': '/tmp/video.mp4', 'title': 'Title', 'uploader': 'Uploader', 'ext': 'mp4',
+            'duration': 10, 'video_id': 'abc', 'source': 'youtube', 'thumbnail': None,
+        }
+        request = mock_flask_request(json_data={'video_url': 'https://youtube.com/watch?v=abc'})
+
+        with patch.object(module, 'download_video', return_value=video_info), \
+                patch.object(module, 'analyze_video_with_gemini', side_effect=lambda *a, **kw: release.wait(5)), \
+                patch.object(module, 'get_storage_client'), \
+                patch.object(module, 'upload_to_gcs', side_effect=RuntimeError("bucket unavailable")):
+            start = time.monotonic()
+            body, status, _ = enrich_video(request)
+            elapsed = time.monotonic() - start
+        release.set()
+
+        assert status == 500
+        assert body['error'] == "bucket unavailable"
+        assert elapsed < 1
+
+
+class TestDownloadAndStoreAudioOnly:
+    """Tests for download_and_store() with audio-only (Spotify podcast) sources."""
+
+    def test_audio_only_source_uses_audio_sections(self, enrich_video, mock_flask_request):
+        from tests.conftest import _video_enricher_module as module
+        from shared.analysis_utils import REQUIRED_AUDIO_ANALYSIS_SECTIONS
+
+        video_info = {
+            'filepath': '/tmp/episode.mp3', 'title': 'Episode', 'uploader': 'Show', 'ext': 'mp3',
+            'duration': 10, 'video_id': 'abc', 'source': 'spotify_via_youtube', 'thumbnail': None,
+        }
+        upload = {'blob_name': 'videos/Episode.mp3', 'public_url': 'https://storage.googleapis.com/b/videos/Episode.mp3',
+                  'size_bytes': 10}
+        request = mock_flask_request(json_data={
+            'video_url': 'https://open.spotify.com/episode/abc', 'transcribe_audio': False
+        })
+
+        with patch.object(module, 'download_video', return_value=video_info), \
+                patch.object(module, 'get_storage_client'), \
+                patch.object(module, 'upload_to_gcs', return_value=upload), \
+                patch.object(module, 'analyze_video_with_gemini',
+                             return_value={'analysis': '', 'error': None}) as mock_gemini:
+            body, status, _ = enrich_video(request)
+
+        assert status == 200
+        assert mock_gemini.call_args.kwargs['audio_only'] is True
+        assert body['metadata']['media_type'] == 'audio'
+        assert body['validation']['required_sections'] == REQUIRED_AUDIO_ANALYSIS_SECTIONS
@@ -61,6 +61,14 @@ class TestErrorClassification:
         # Empty URL should fail validation or fetch
         assert status_code == 400 or 'error' in data
 
+    def test_non_string_url_is_fatal_error(self, mock_flask_request, enrich_webpage):
+        """A URL that isn't a string is rejected like a missing one."""
+        request = mock_flask_request(json_data={'url': 12345})
+        response, status_code, headers = enrich_webpage(request)
+
+        assert status_code == 400
+        assert 'url' in json.loads(response)['error'].lower()
+
     def test_invalid_url_format_is_error(self, mock_flask_request, enrich_webpage):
         """Invalid URL format should produce an error."""
         request = mock_flask_request(json_data={'url': 'not-a-valid-url'})
@@ -1384,6 +1392,31 @@ class TestVideoEnrichmentValidation:
         assert result['valid'] is True
         assert result['transcription_validation'] is None
 
+    def test_audio_only_analysis_passes_with_audio_sections(self):
+        """Audio-only analysis is validated without the visual sections."""
+        from shared.analysis_utils import validate_video_enrichment, REQUIRED_AUDIO_ANALYSIS_SECTIONS
+
+        response = {
+            'success': True,
+            'gemini_analysis': {
+                'analysis': """1. **🔊 Audio Content**
+Two hosts discuss pasta recipes.
+
+2. **🎭 Mood & Tone**
+Relaxed and friendly.
+
+3. **💡 Key Messages**
+Salt the water.
+
+4. **📁 Content Category**
+Podcast/Educational.""",
+                'error': None
+            }
+        }
+
+        assert validate_video_enrichment(response, REQUIRED_AUDIO_ANALYSIS_SECTIONS)['valid'] is True
+        assert validate_video_enrichment(response)['valid'] is False
+
     def test_all_six_sections_are_required(self):
         """Verify all 6 user-specified sections are required for video."""
         from shared.analysis_utils import REQUIRED_ANALYSIS_SECTIONS
@@ -1414,9 +1447,9 @@ class TestSectionIcons:
 
     def test_all_required_sections_have_icons(self):
         """Every required section must have an icon defined."""
-        from shared.analysis_utils import REQUIRED_ANALYSIS_SECTIONS, SECTION_ICONS
+        from shared.analysis_utils import REQUIRED_ANALYSIS_SECTIONS, REQUIRED_AUDIO_ANALYSIS_SECTIONS, SECTION_ICONS
 
-        for section in REQUIRED_ANALYSIS_SECTIONS:
+        for section in REQUIRED_ANALYSIS_SECTIONS + REQUIRED_AUDIO_ANALYSIS_SECTIONS:
             assert section in SECTION_ICONS, \
                 f"Section '{section}' must have an icon in SECTION_ICONS"
             assert SECTION_ICONS[section], \
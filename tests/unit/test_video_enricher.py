@@ -5,6 +5,7 @@ Tests pure functions that don't require external API calls.
 """
 
 import pytest
+from unittest.mock import MagicMock, patch
 
 
 class TestIsSpotifyPodcast:
@@ -119,3 +120,138 @@ class TestGenerateSmartFilename:
         result = generate_smart_filename("Title", "", "mp4")
         assert "Title" in result
         assert result.endswith(".mp4")
+
+
+class TestYoutubeUrlCache:
+    """Tests for get_cached_youtube_url() / cache_youtube_url() (in-memory layer)"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from tests.conftest import _video_enricher_module
+        _video_enricher_module._YT_CACHE.clear()
+        yield
+        _video_enricher_module._YT_CACHE.clear()
+
+    def test_miss_without_storage(self, get_cached_youtube_url):
+        assert get_cached_youtube_url("https://open.spotify.com/episode/abc123") is None
+
+    def test_hit_after_cache(self, get_cached_youtube_url, cache_youtube_url):
+        cache_youtube_url("https://open.spotify.com/episode/abc123", "https://youtube.com/watch?v=xyz")
+        assert get_cached_youtube_url("https://open.spotify.com/episode/abc123") == "https://youtube.com/watch?v=xyz"
+
+    def test_share_params_ignored(self, get_cached_youtube_url, cache_youtube_url):
+        cache_youtube_url("https://open.spotify.com/episode/abc123?si=one", "https://youtube.com/watch?v=xyz")
+        assert get_cached_youtube_url("https://open.spotify.com/episode/abc123?si=two") == "https://youtube.com/watch?v=xyz"
+
+    def test_different_episodes_not_shared(self, get_cached_youtube_url, cache_youtube_url):
+        cache_youtube_url("https://open.spotify.com/episode/abc123", "https://youtube.com/watch?v=xyz")
+        assert get_cached_youtube_url("https://open.spotify.com/episode/def456") is None
+
+
+class TestAnalyzeVideoWithGemini:
+    """Tests for analyze_video_with_gemini() with the Gemini SDK mocked"""
+
+    @pytest.fixture
+    def genai(self):
+        from tests.conftest import _video_enricher_module
+        with patch.object(_video_enricher_module, 'genai') as genai:
+            genai.upload_file.return_value.state.name = "ACTIVE"
+            yield genai
+
+    def test_skips_chunks_without_parts(self, analyze_video_with_gemini, genai):
+        class EmptyChunk:
+            parts = []
+
+            @property
+            def text(self):
+                raise ValueError("no text")
+
+        chunks = [MagicMock(parts=[1], text="Hello "), EmptyChunk(), MagicMock(parts=[1], text="world")]
+        genai.GenerativeModel.return_value.generate_content.return_value = iter(chunks)
+
+        result = analyze_video_with_gemini("/tmp/video.mp4", api_key="key")
+
+        assert result['error'] is None
+        assert result['analysis'] == "Hello world"
+        genai.delete_file.assert_called_once()
+
+    def test_audio_only_prompt_has_no_visual_sections(self, analyze_video_with_gemini, genai):
+        from shared.analysis_utils import REQUIRED_AUDIO_ANALYSIS_SECTIONS
+        model = genai.GenerativeModel.return_value
+        model.generate_content.return_value = iter([MagicMock(parts=[1], text="analysis")])
+
+        analyze_video_with_gemini("/tmp/episode.mp3", api_key="key", audio_only=True)
+
+        prompt = model.generate_content.call_args[0][0][1]
+        assert "Visual Content" not in prompt
+        assert "Style & Production" not in prompt
+        for section in REQUIRED_AUDIO_ANALYSIS_SECTIONS:
+            assert section in prompt
+
+    def test_deletes_file_when_generation_fails(self, analyze_video_with_gemini, genai):
+        genai.GenerativeModel.return_value.generate_content.side_effect = RuntimeError("quota")
+
+        result = analyze_video_with_gemini("/tmp/video.mp4", api_key="key")
+
+        assert result['error'] == "quota"
+        genai.delete_file.assert_called_once()
+
+
+class TestExtractAudioToGcs:
+    """Tests for extract_audio_to_gcs() with ffmpeg and Cloud Storage mocked"""
+
+    @pytest.fixture
+    def popen(self):
+        from tests.conftest import _video_enricher_module
+        with patch.object(_video_enricher_module.subprocess, 'Popen') as popen:
+            yield popen
+
+    def test_streams_audio_to_blob_and_local_file(self, extract_audio_to_gcs, popen, tmp_path):
+        popen.return_value.stdout.read.side_effect = [b"mp3", b"data", b""]
+        popen.return_value.wait.return_value = 0
+        client = MagicMock()
+        blob = client.bucket.return_value.blob.return_value
+
+        audio_path, info = extract_audio_to_gcs(client, "/videos/clip.mp4", str(tmp_path), "clip.mp3")
+
+        assert audio_path == str(tmp_path / "clip.mp3")
+        assert (tmp_path / "clip.mp3").read_bytes() == b"mp3data"
+        assert info['blob_name'] == "videos/clip.mp3"
+        assert info['size_bytes'] == 7
+        blob.delete.assert_not_called()
+
+    def test_nonzero_exit_deletes_partial_blob(self, extract_audio_to_gcs, popen, tmp_path, capsys):
+        def start_ffmpeg(*args, stderr=None, **kwargs):
+            stderr.write(b"clip.mp4: Invalid data found when processing input")
+            return proc
+
+        proc = MagicMock()
+        proc.stdout.read.side_effect = [b"partial", b""]
+        proc.wait.return_value = 1
+        popen.side_effect = start_ffmpeg
+        client = MagicMock()
+        blob = client.bucket.return_value.blob.return_value
+
+        result = extract_audio_to_gcs(client, "/videos/clip.mp4", str(tmp_path), "clip.mp3")
+
+        assert result == (None, None)
+        blob.delete.assert_called_once()
+        assert "Invalid data found" in capsys.readouterr().out
+
+
+class TestGetTranscriber:
+    """Tests for _get_transcriber()"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from tests.conftest import _video_enricher_module
+        _video_enricher_module._ASSEMBLYAI_TRANSCRIBERS.clear()
+        yield
+        _video_enricher_module._ASSEMBLYAI_TRANSCRIBERS.clear()
+
+    def test_client_uses_given_key_and_is_cached(self):
+        from tests.conftest import _video_enricher_module
+        transcriber = _video_enricher_module._get_transcriber("key-1")
+        assert transcriber._client.settings.api_key == "key-1"
+        assert _video_enricher_module._get_transcriber("key-1") is transcriber
+        assert _video_enricher_module._get_transcriber("key-2") is not transcriber
@@ -5,7 +5,8 @@ Tests pure functions that don't require external API calls.
 """
 
 import pytest
-from bs4 import BeautifulSoup
+import lxml.html
+from unittest.mock import patch
 
 
 class TestExtractSpotifyEpisodeId:
@@ -39,37 +40,31 @@ class TestExtractSpotifyEpisodeId:
         assert extract_spotify_episode_id(url) == "shortID123"
 
 
-class TestCalculateReadingTime:
-    """Tests for calculate_reading_time()"""
+class TestReadingTimeForWords:
+    """Tests for reading_time_for_words()"""
 
-    def test_empty_text(self, calculate_reading_time):
-        assert calculate_reading_time("") == 0
+    def test_no_words(self, reading_time_for_words):
+        assert reading_time_for_words(0) == 0
 
-    def test_none_text(self, calculate_reading_time):
-        assert calculate_reading_time(None) == 0
+    def test_none_count(self, reading_time_for_words):
+        assert reading_time_for_words(None) == 0
 
-    def test_short_article_one_minute(self, calculate_reading_time):
+    def test_short_article_one_minute(self, reading_time_for_words):
         # 225 words = 1 minute at 225 wpm
-        text = " ".join(["word"] * 225)
-        assert calculate_reading_time(text) == 1
+        assert reading_time_for_words(225) == 1
 
-    def test_two_minute_read(self, calculate_reading_time):
-        # 450 words = 2 minutes
-        text = " ".join(["word"] * 450)
-        assert calculate_reading_time(text) == 2
+    def test_two_minute_read(self, reading_time_for_words):
+        assert reading_time_for_words(450) == 2
 
-    def test_five_minute_read(self, calculate_reading_time):
-        # 1125 words = 5 minutes
-        text = " ".join(["word"] * 1125)
-        assert calculate_reading_time(text) == 5
+    def test_five_minute_read(self, reading_time_for_words):
+        assert reading_time_for_words(1125) == 5
 
-    def test_minimum_one_minute(self, calculate_reading_time):
+    def test_minimum_one_minute(self, reading_time_for_words):
         # Even very short text returns at least 1 minute
-        text = "Hello world"
-        assert calculate_reading_time(text) == 1
+        assert reading_time_for_words(2) == 1
 
-    def test_single_word(self, calculate_reading_time):
-        assert calculate_reading_time("hello") == 1
+    def test_single_word(self, reading_time_for_words):
+        assert reading_time_for_words(1) == 1
 
 
 class TestDetectContentType:
@@ -120,6 +115,38 @@ class TestDetectContentType:
         result = detect_content_type("https://somestore.com/item", sample_product_html)
         assert result == "product"
 
+    def test_product_page_by_raw_html(self, detect_content_type):
+        html = "<html><body><button>Add to Cart</button></body></html>"
+        tree = lxml.html.document_fromstring(html)
+        assert detect_content_type("https://somestore.com/item", tree, html) == "product"
+
+    def test_purchase_in_attributes_is_not_product(self, detect_content_type):
+        html = ('<html><body><a href="/purchase-history" class="purchase-btn">History</a>'
+                '<p>Repurchased items</p></body></html>')
+        tree = lxml.html.document_fromstring(html)
+        assert detect_content_type("https://somestore.com/item", tree, html) == "article"
+
+    def test_purchase_in_script_is_not_product(self, detect_content_type):
+        html = "<html><head><script>track('purchase')</script></head><body><p>Hi</p></body></html>"
+        tree = lxml.html.document_fromstring(html)
+        assert detect_content_type("https://somestore.com/item", tree, html) == "article"
+        assert detect_content_type("https://somestore.com/item", tree) == "article"
+
+    def test_raw_html_and_tree_checks_agree(self, detect_content_type):
+        html = '<html><body><p>Buy now</p><a href="/purchase">Orders</a></body></html>'
+        tree = lxml.html.document_fromstring(html)
+        assert detect_content_type("https://somestore.com/item", tree, html) == "product"
+        assert detect_content_type("https://somestore.com/item", tree) == "product"
+
+    def test_large_style_block_is_linear(self, detect_content_type):
+        import time
+        html = ('<html><head><style>' + 'nav > ul > li > a { color: red }\n' * 3000 +
+                '</style></head><body><p>Hello</p></body></html>')
+        tree = lxml.html.document_fromstring(html)
+        start = time.monotonic()
+        assert detect_content_type("https://somestore.com/item", tree, html) == "article"
+        assert time.monotonic() - start < 0.5
+
     def test_code_page_by_content(self, detect_content_type, sample_code_html):
         # Page with many code blocks detected as code
         result = detect_content_type("https://tutorials.example.com/python", sample_code_html)
@@ -141,12 +168,30 @@ class TestExtractMetadata:
         metadata = extract_metadata("https://example.com", sample_article_html)
         assert metadata['main_image'] == "https://example.com/image.jpg"
 
-    def test_missing_fields(self, extract_metadata, empty_soup):
-        metadata = extract_metadata("https://example.com", empty_soup)
+    def test_missing_fields(self, extract_metadata, empty_tree):
+        metadata = extract_metadata("https://example.com", empty_tree)
         assert metadata['title'] is None
         assert metadata['author'] is None
 
 
+class TestExtractMainContent:
+    """Tests for extract_main_content()"""
+
+    def test_article_text_and_word_count(self, extract_main_content, sample_article_html):
+        text, word_count = extract_main_content(sample_article_html)
+        assert text == "10 Python Tips You Should Know Here are some tips for Python development."
+        assert word_count == len(text.split())
+
+    def test_skips_navigation_and_scripts(self, extract_main_content):
+        html = ('<html><body><nav>Menu</nav><main><p>Real   content</p>'
+                '<script>var x = 1;</script></main><footer>Footer</footer></body></html>')
+        tree = lxml.html.document_fromstring(html)
+        assert extract_main_content(tree) == ("Real content", 2)
+
+    def test_none_tree(self, extract_main_content):
+        assert extract_main_content(None) == ("", 0)
+
+
 class TestExtractPrice:
     """Tests for extract_price()"""
 
@@ -160,29 +205,29 @@ class TestExtractPrice:
         assert result['price'] is None
         assert result['currency'] is None
 
-    def test_none_soup(self, extract_price):
+    def test_none_tree(self, extract_price):
         result = extract_price(None)
         assert result['price'] is None
         assert result['currency'] is None
 
     def test_gbp_price(self, extract_price):
         html = '<html><body><span class="price">£19.99</span></body></html>'
-        soup = BeautifulSoup(html, 'html.parser')
-        result = extract_price(soup)
+        tree = lxml.html.document_fromstring(html)
+        result = extract_price(tree)
         assert result['price'] == 19.99
         assert result['currency'] == 'GBP'
 
     def test_eur_price(self, extract_price):
         html = '<html><body><span class="price">€49.00</span></body></html>'
-        soup = BeautifulSoup(html, 'html.parser')
-        result = extract_price(soup)
+        tree = lxml.html.document_fromstring(html)
+        result = extract_price(tree)
         assert result['price'] == 49.00
         assert result['currency'] == 'EUR'
 
     def test_price_with_itemprop(self, extract_price):
         html = '<html><body><span itemprop="price">99.99</span></body></html>'
-        soup = BeautifulSoup(html, 'html.parser')
-        result = extract_price(soup)
+        tree = lxml.html.document_fromstring(html)
+        result = extract_price(tree)
         assert result['price'] == 99.99
 
 
@@ -193,14 +238,60 @@ class TestExtractCodeSnippets:
         snippets = extract_code_snippets(sample_code_html)
         assert len(snippets) > 0
 
-    def test_empty_soup(self, extract_code_snippets, empty_soup):
-        snippets = extract_code_snippets(empty_soup)
+    def test_empty_tree(self, extract_code_snippets, empty_tree):
+        snippets = extract_code_snippets(empty_tree)
         assert snippets == []
 
-    def test_none_soup(self, extract_code_snippets):
+    def test_none_tree(self, extract_code_snippets):
         snippets = extract_code_snippets(None)
         assert snippets == []
 
     def test_no_code_blocks(self, extract_code_snippets, sample_article_html):
         snippets = extract_code_snippets(sample_article_html)
         assert snippets == []
+
+    def test_caps_at_five_snippets(self, extract_code_snippets):
+        html = '<html><body>' + '<pre>print("snippet number {}")</pre>' * 8 + '</body></html>'
+        tree = lxml.html.document_fromstring(html)
+        assert len(extract_code_snippets(tree)) == 5
+
+
+class TestThrottle:
+    """Tests for _throttle()"""
+
+    def test_spaces_out_consecutive_calls(self):
+        import threading
+        import time
+        from tests.conftest import _webpage_enricher_module
+
+        limiter = {'interval': 0.05, 'next_at': 0.0, 'lock': threading.Lock()}
+        start = time.monotonic()
+        for _ in range(3):
+            _webpage_enricher_module._throttle(limiter)
+        assert time.monotonic() - start >= 0.1
+
+
+class TestGetTranscriber:
+    """Tests for _get_transcriber()"""
+
+    def test_client_uses_configured_key(self):
+        from tests.conftest import _webpage_enricher_module as module
+        with patch.object(module, '_aai_transcriber', None), \
+                patch.object(module, 'ASSEMBLYAI_API_KEY', "key-1"):
+            transcriber = module._get_transcriber()
+            assert transcriber._client.settings.api_key == "key-1"
+            assert module._get_transcriber() is transcriber
+
+
+class TestSessionRetries:
+    """Tests for the shared session's per-host retry policy"""
+
+    def test_page_fetches_are_not_retried(self):
+        from tests.conftest import _webpage_enricher_module
+        adapter = _webpage_enricher_module._SESSION.get_adapter("https://example.com/article")
+        assert adapter.max_retries.total == 0
+
+    def test_api_hosts_are_retried(self):
+        from tests.conftest import _webpage_enricher_module
+        adapter = _webpage_enricher_module._SESSION.get_adapter("https://api.spotify.com/v1/episodes/abc")
+        assert adapter.max_retries.total == 3
@@ -1,6 +1,7 @@
 import functions_framework
 from google.oauth2 import service_account
 from google.cloud import storage
+from google.api_core.exceptions import NotFound
 import google.generativeai as genai
 import assemblyai as aai
 import yt_dlp
@@ -9,14 +10,18 @@ import subprocess
 import os
 import sys
 import json
+import hashlib
 import traceback
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta
 
 # Add shared module to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from shared.title_utils import truncate_title, validate_title, sanitize_title, MAX_TITLE_LENGTH
-from shared.analysis_utils import validate_video_enrichment, REQUIRED_ANALYSIS_SECTIONS, SECTION_ICONS
+from shared.analysis_utils import (
+    validate_video_enrichment, REQUIRED_ANALYSIS_SECTIONS, REQUIRED_AUDIO_ANALYSIS_SECTIONS, SECTION_ICONS,
+)
 
 # Configuration
 BUCKET_NAME = os.environ.get('GCS_BUCKET', 'video-processor-temp-rhe')
@@ -24,6 +29,36 @@ SCOPES = ['https://www.googleapis.com/auth/cloud-platform']
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')  # Required: set via Cloud Function environment variable
 ASSEMBLYAI_API_KEY = os.environ.get('ASSEMBLYAI_API_KEY')  # Required for transcription
 
+# yt-dlp options that skip extraction and post-processing work we never use
+YTDLP_MINIMAL_OPTS = {
+    'writesubtitles': False,
+    'writeautomaticsub': False,
+    'getcomments': False,
+    'writeinfojson': False,
+    'check_formats': False,
+    'postprocessors': [],
+}
+
+
+class _NullLogger:
+    """yt-dlp logger that drops output to avoid stdout/stderr issues in Cloud Functions."""
+
+    def debug(self, msg): pass
+    def info(self, msg): pass
+    def warning(self, msg): pass
+    def error(self, msg): print(f"yt-dlp error: {msg}")
+
+
+_NULL_LOGGER = _NullLogger()
+
+# Spotify episode -> YouTube URL mappings resolved on this (warm) instance.
+# Backed by GCS under YOUTUBE_CACHE_PREFIX so mappings survive cold starts.
+YOUTUBE_CACHE_PREFIX = 'cache/spotify-yt'
+_YT_CACHE = {}
+
+# AssemblyAI transcribers reused across warm invocations, keyed by API key
+_ASSEMBLYAI_TRANSCRIBERS = {}
+
 
 def get_storage_client():
     """Initialize Cloud Storage client."""
@@ -65,7 +100,7 @@ def get_spotify_metadata(url):
 
 
 def search_youtube_with_api(query, max_results=5):
-    """Search YouTube using the YouTube Data API (falls back from yt-dlp)."""
+    """Search YouTube using the YouTube Data API."""
     import requests
 
     api_key = os.environ.get('GEMINI_API_KEY')  # Try Google API key
@@ -98,34 +133,9 @@ def search_youtube_with_api(query, max_results=5):
     return None
 
 
-def search_youtube_for_podcast(episode_title, show_name=None, max_results=10):
-    """Search YouTube for a podcast episode by title.
-
-    Returns the best matching YouTube URL or None if not found.
-    """
+def search_youtube_with_ytdlp(query, max_results=10):
+    """Search YouTube using yt-dlp's ytsearch extractor (no API key needed)."""
     try:
-        print(f"Searching YouTube for: {episode_title}")
-
-        # Clean up title for better search
-        search_query = episode_title
-        # Remove common podcast prefixes
-        for prefix in ['Most Replayed Moment:', 'Ep.', 'Episode', '#']:
-            if search_query.startswith(prefix):
-                search_query = search_query[len(prefix):].strip()
-
-        # Add show name to improve search if available
-        if show_name and show_name not in search_query:
-            search_query = f"{show_name} {search_query}"
-
-        print(f"Search query: {search_query}")
-
-        # Try YouTube Data API first (more reliable in cloud)
-        api_result = search_youtube_with_api(search_query)
-        if api_result:
-            return api_result
-
-        # Fallback to yt-dlp search
-        print("Trying yt-dlp search fallback...")
         ydl_opts = {
             'quiet': True,
             'no_warnings': True,
@@ -143,10 +153,16 @@ def search_youtube_for_podcast(episode_title, show_name=None, max_results=10):
         }
 
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            results = ydl.extract_info(f"ytsearch{max_results}:{search_query}", download=False)
+            # process=False returns the raw flat search entries without a
+            # second processing pass over each result
+            results = ydl.extract_info(
+                f"ytsearch{max_results}:{query}",
+                download=False,
+                process=False,
+            )
+            entries = list(results.get('entries') or []) if results else []
 
-            if results and results.get('entries'):
-                entries = results['entries']
+            if entries:
                 print(f"Found {len(entries)} YouTube results")
 
                 # Return first result that looks like it could be the podcast
@@ -167,6 +183,46 @@ def search_youtube_for_podcast(episode_title, show_name=None, max_results=10):
                     youtube_url = f"https://youtube.com/watch?v={first_entry['id']}"
                     print(f"Using first result: {first_entry.get('title')}")
                     return youtube_url
+    except Exception as e:
+        print(f"yt-dlp search failed: {e}")
+    return None
+
+
+def search_youtube_for_podcast(episode_title, show_name=None, max_results=10):
+    """Search YouTube for a podcast episode by title.
+
+    Runs the YouTube Data API and yt-dlp searches in parallel and returns
+    the first match found, or None if neither finds the episode.
+    """
+    try:
+        print(f"Searching YouTube for: {episode_title}")
+
+        # Clean up title for better search
+        search_query = episode_title
+        # Remove common podcast prefixes
+        for prefix in ['Most Replayed Moment:', 'Ep.', 'Episode', '#']:
+            if search_query.startswith(prefix):
+                search_query = search_query[len(prefix):].strip()
+
+        # Add show name to improve search if available
+        if show_name and show_name not in search_query:
+            search_query = f"{show_name} {search_query}"
+
+        print(f"Search query: {search_query}")
+
+        pool = ThreadPoolExecutor(max_workers=2)
+        futures = [
+            pool.submit(search_youtube_with_api, search_query),
+            pool.submit(search_youtube_with_ytdlp, search_query, max_results),
+        ]
+        try:
+            for future in as_completed(futures):
+                youtube_url = future.result()
+                if youtube_url:
+                    return youtube_url
+        finally:
+            # Don't block on the slower search once we have an answer
+            pool.shutdown(wait=False, cancel_futures=True)
 
         print("No YouTube results found")
         return None
@@ -176,12 +232,63 @@ def search_youtube_for_podcast(episode_title, show_name=None, max_results=10):
         return None
 
 
+def _youtube_cache_key(url):
+    """Cache key for a Spotify episode URL (share query params like ?si= ignored)."""
+    canonical_url = url.split('?', 1)[0].split('#', 1)[0].rstrip('/')
+    return hashlib.sha256(canonical_url.encode('utf-8')).hexdigest()
+
+
+def get_cached_youtube_url(url, storage_client=None):
+    """Return a previously resolved YouTube URL for a Spotify episode, or None.
+
+    Checks the in-memory cache first, then the GCS cache when a storage
+    client is given. Cache failures are logged and treated as a miss.
+    """
+    key = _youtube_cache_key(url)
+    if key in _YT_CACHE:
+        return _YT_CACHE[key]
+
+    if storage_client is None:
+        return None
+
+    try:
+        blob = storage_client.bucket(BUCKET_NAME).blob(f"{YOUTUBE_CACHE_PREFIX}/{key}.json")
+        cached = json.loads(blob.download_as_text())
+        youtube_url = cached.get('youtube_url')
+        if youtube_url:
+            _YT_CACHE[key] = youtube_url
+        return youtube_url
+    except NotFound:
+        return None
+    except Exception as e:
+        print(f"YouTube cache lookup failed: {e}")
+        return None
+
+
+def cache_youtube_url(url, youtube_url, episode_title=None, storage_client=None):
+    """Remember the YouTube URL resolved for a Spotify episode."""
+    key = _youtube_cache_key(url)
+    _YT_CACHE[key] = youtube_url
+
+    if storage_client is None:
+        return
+
+    try:
+        blob = storage_client.bucket(BUCKET_NAME).blob(f"{YOUTUBE_CACHE_PREFIX}/{key}.json")
+        blob.upload_from_string(
+            json.dumps({'youtube_url': youtube_url, 'episode_title': episode_title}),
+            content_type='application/json'
+        )
+    except Exception as e:
+        print(f"YouTube cache write failed: {e}")
+
+
 def download_spotify_podcast(url, tmpdir):
     """Download Spotify podcast by finding it on YouTube.
 
     Strategy:
     1. Get episode metadata from Spotify oEmbed
-    2. Search YouTube for the episode
+    2. Search YouTube for the episode (unless a cached match exists)
     3. Download from YouTube if found
     """
     print(f"Processing Spotify podcast: {url}")
@@ -196,19 +303,29 @@ def download_spotify_podcast(url, tmpdir):
     print(f"Episode title: {episode_title}")
     print(f"Show name: {show_name}")
 
-    # Search YouTube for this episode - try with show name first, then without
-    youtube_url = search_youtube_for_podcast(episode_title, show_name)
+    # Reuse a previous Spotify -> YouTube resolution (e.g. n8n retries)
+    storage_client = get_storage_client()
+    youtube_url = get_cached_youtube_url(url, storage_client)
 
-    if not youtube_url:
-        # Try searching with just the title
-        print("No results with show name, trying title only...")
-        youtube_url = search_youtube_for_podcast(episode_title)
+    if youtube_url:
+        print(f"Using cached YouTube match: {youtube_url}")
+    else:
+        # Search YouTube for this episode - try with show name first, then without
+        youtube_url = search_youtube_for_podcast(episode_title, show_name)
+
+        if not youtube_url:
+            # Try searching with just the title
+            print("No results with show name, trying title only...")
+            youtube_url = search_youtube_for_podcast(episode_title)
+
+        if youtube_url:
+            cache_youtube_url(url, youtube_url, episode_title, storage_client)
 
     if youtube_url:
         print(f"Found on YouTube: {youtube_url}")
         try:
-            # Download from YouTube using existing function
-            result = download_with_ytdlp(youtube_url, tmpdir)
+            # Download audio only - the podcast video track is just artwork
+            result = download_with_ytdlp(youtube_url, tmpdir, audio_only=True)
             # Override some metadata with Spotify info
             result['source'] = 'spotify_via_youtube'
             result['original_url'] = url
@@ -274,13 +391,6 @@ def download_tiktok_with_ytdlp(url, tmpdir):
 
     output_template = os.path.join(str(tmpdir), '%(id)s.%(ext)s')
 
-    # Create a null logger to avoid stdout/stderr issues in Cloud Functions
-    class NullLogger:
-        def debug(self, msg): pass
-        def info(self, msg): pass
-        def warning(self, msg): pass
-        def error(self, msg): print(f"yt-dlp error: {msg}")
-
     ydl_opts = {
         'format': 'best[ext=mp4]/best',
         'outtmpl': output_template,
@@ -289,7 +399,11 @@ def download_tiktok_with_ytdlp(url, tmpdir):
         'noprogress': True,
         'extract_flat': False,
         'socket_timeout': 30,
-        'logger': NullLogger(),
+        # TikTok serves a single file, so fewer parallel range requests are needed
+        'concurrent_fragment_downloads': 4,
+        'http_chunk_size': 10 * 1024 * 1024,
+        'logger': _NULL_LOGGER,
+        **YTDLP_MINIMAL_OPTS,
     }
 
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
@@ -377,8 +491,12 @@ def download_tiktok_with_rapidapi(url, tmpdir):
     }
 
 
-def download_with_ytdlp(url, tmpdir):
-    """Download video using yt-dlp for non-TikTok sources."""
+def download_with_ytdlp(url, tmpdir, audio_only=False):
+    """Download video using yt-dlp for non-TikTok sources.
+
+    With audio_only=True, only the best audio stream is downloaded and
+    converted to MP3 (podcasts, where the video track is a static image).
+    """
     output_template = os.path.join(tmpdir, '%(id)s.%(ext)s')
 
     ydl_opts = {
@@ -399,12 +517,24 @@ def download_with_ytdlp(url, tmpdir):
         'socket_timeout': 60,
         'retries': 3,
         'fragment_retries': 3,
+        # Fetch HLS/DASH fragments in parallel and use larger HTTP range chunks
+        'concurrent_fragment_downloads': 8,
+        'http_chunk_size': 10 * 1024 * 1024,
+        **YTDLP_MINIMAL_OPTS,
     }
 
+    if audio_only:
+        ydl_opts['format'] = 'bestaudio[ext=m4a]/bestaudio'
+        ydl_opts['postprocessors'] = [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            'preferredquality': '2',
+        }]
+
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         info = ydl.extract_info(url, download=True)
         video_id = info.get('id', 'unknown')
-        ext = info.get('ext', 'mp4')
+        ext = 'mp3' if audio_only else info.get('ext', 'mp4')
         filepath = os.path.join(tmpdir, f"{video_id}.{ext}")
 
         # Detect source
@@ -425,21 +555,85 @@ def download_with_ytdlp(url, tmpdir):
         }
 
 
-def extract_audio(video_path, tmpdir):
-    """Extract audio from video using ffmpeg."""
-    audio_filename = os.path.basename(video_path).rsplit('.', 1)[0] + '.mp3'
-    audio_path = os.path.join(tmpdir, audio_filename)
+def extract_audio_to_gcs(client, video_path, tmpdir, filename):
+    """Extract MP3 audio with ffmpeg, streaming it to Cloud Storage while it encodes.
 
+    ffmpeg writes to stdout; each chunk is written to a resumable GCS upload
+    and to a local copy in tmpdir (needed for transcription), so encoding
+    and uploading overlap instead of running back to back.
+
+    Returns (audio_path, upload_info), or (None, None) if extraction fails.
+    """
+    audio_path = os.path.join(tmpdir, os.path.basename(video_path).rsplit('.', 1)[0] + '.mp3')
+    blob_name = f"videos/{filename}"
+    blob = client.bucket(BUCKET_NAME).blob(blob_name)
+
+    # CBR output: a piped MP3 can't be seeked back to write the VBR (Xing)
+    # header, which players need for an accurate duration. stderr goes to a
+    # file rather than a pipe so a chatty ffmpeg can't block on it
+    stderr_path = audio_path + '.log'
+    with open(stderr_path, 'wb') as stderr_file:
+        proc = subprocess.Popen([
+            'ffmpeg', '-nostdin', '-loglevel', 'error', '-i', video_path,
+            '-vn', '-acodec', 'libmp3lame', '-b:a', '192k',
+            '-f', 'mp3', 'pipe:1'
+        ], stdout=subprocess.PIPE, stderr=stderr_file)
+
+    size = 0
     try:
-        subprocess.run([
-            'ffmpeg', '-i', video_path,
-            '-vn', '-acodec', 'libmp3lame', '-q:a', '2',
-            '-y', audio_path
-        ], check=True, capture_output=True)
-        return audio_path
-    except subprocess.CalledProcessError as e:
+        with open(audio_path, 'wb') as local_file, \
+                blob.open('wb', content_type='audio/mpeg', chunk_size=8 * 1024 * 1024) as gcs_stream:
+            while True:
+                data = proc.stdout.read(1 << 20)
+                if not data:
+                    break
+                local_file.write(data)
+                gcs_stream.write(data)
+                size += len(data)
+        returncode = proc.wait()
+    except Exception as e:
+        proc.kill()
+        proc.wait()
         print(f"Audio extraction failed: {e}")
-        return None
+        return None, None
+
+    if returncode != 0 or size == 0:
+        with open(stderr_path, 'rb') as stderr_file:
+            stderr_tail = stderr_file.read()[-2000:].decode('utf-8', 'replace').strip()
+        print(f"Audio extraction failed: ffmpeg exited with code {returncode}: {stderr_tail}")
+        try:
+            blob.delete()
+        except Exception:
+            pass
+        return None, None
+
+    return audio_path, {
+        'blob_name': blob_name,
+        'public_url': f"https://storage.googleapis.com/{BUCKET_NAME}/{blob_name}",
+        'size_bytes': size
+    }
+
+
+def _get_transcriber(api_key):
+    """Return a cached AssemblyAI transcriber for this API key.
+
+    Each transcriber owns an HTTP client, so reusing it keeps connections
+    (and TLS sessions) alive between invocations on a warm instance.
+    """
+    transcriber = _ASSEMBLYAI_TRANSCRIBERS.get(api_key)
+    if transcriber is None:
+        # Auto language detection
+        config = aai.TranscriptionConfig(
+            language_detection=True,
+            punctuate=True,
+            format_text=True,
+        )
+        # Explicit client: older assemblyai releases (down to the pinned
+        # 0.35) have no api_key argument on Transcriber
+        client = aai.Client(settings=aai.Settings(api_key=api_key))
+        transcriber = aai.Transcriber(client=client, config=config)
+        _ASSEMBLYAI_TRANSCRIBERS[api_key] = transcriber
+    return transcriber
 
 
 def transcribe_audio(audio_path, api_key=None):
@@ -459,17 +653,7 @@ def transcribe_audio(audio_path, api_key=None):
     try:
         print(f"Starting audio transcription for: {audio_path}")
 
-        # Configure AssemblyAI
-        aai.settings.api_key = api_key
-
-        # Create transcriber with auto language detection
-        config = aai.TranscriptionConfig(
-            language_detection=True,
-            punctuate=True,
-            format_text=True,
-        )
-
-        transcriber = aai.Transcriber(config=config)
+        transcriber = _get_transcriber(api_key)
 
         # Transcribe the audio file
         print("Uploading and transcribing audio...")
@@ -513,12 +697,17 @@ def upload_to_gcs(client, filepath, filename):
     else:
         content_type = 'video/mp4'
 
-    # Upload file
-    blob.upload_from_filename(filepath, content_type=content_type)
-
-    # Get file size
-    blob.reload()
-    size = blob.size
+    # Upload from an open handle with a known size; the default checksum is
+    # computed while the upload streams, so integrity checking costs no
+    # extra read pass
+    size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as f:
+        blob.upload_from_file(
+            f,
+            content_type=content_type,
+            size=size,
+            rewind=False,
+        )
 
     # Generate public URL (bucket is already public via IAM)
     public_url = f"https://storage.googleapis.com/{BUCKET_NAME}/{blob_name}"
@@ -547,11 +736,29 @@ def generate_smart_filename(title, uploader, ext='mp4'):
     return f"{sanitized_title} - {capitalized_uploader}.{ext}"
 
 
-def analyze_video_with_gemini(video_path, api_key=None):
+_AUDIO_ANALYSIS_PROMPT = """Analyze this audio recording in detail. Provide a comprehensive analysis covering:
+
+1. **🔊 Audio Content**
+Describe the audio - speakers, what is discussed (summarize what is said), music, sound effects, and overall audio quality.
+
+2. **🎭 Mood & Tone**
+Describe the overall mood, emotional tone, and atmosphere of the recording.
+
+3. **💡 Key Messages**
+What are the main points, messages, or takeaways from this recording?
+
+4. **📁 Content Category**
+What type of content is this? (e.g., interview, tutorial, news, storytelling, educational, etc.)
+
+Be specific and detailed in your analysis."""
+
+
+def analyze_video_with_gemini(video_path, api_key=None, audio_only=False):
     """Analyze video content using Gemini 1.5 Pro.
 
     Uses the File API for reliable video upload and processing.
-    Returns detailed analysis of video content.
+    Returns detailed analysis of video content. With audio_only=True (an
+    MP3 source), the prompt asks only for the REQUIRED_AUDIO_ANALYSIS_SECTIONS.
     """
     api_key = api_key or GEMINI_API_KEY
     if not api_key:
@@ -568,28 +775,29 @@ def analyze_video_with_gemini(video_path, api_key=None):
         video_file = genai.upload_file(path=video_path)
         print(f"Upload complete. File name: {video_file.name}")
 
-        # Wait for file to be processed
-        print("Waiting for video processing...")
-        max_wait = 120  # Maximum wait time in seconds
-        wait_time = 0
-        while video_file.state.name == "PROCESSING" and wait_time < max_wait:
-            time.sleep(5)
-            wait_time += 5
-            video_file = genai.get_file(video_file.name)
-            print(f"Processing... ({wait_time}s)")
+        try:
+            # Wait for file to be processed
+            print("Waiting for video processing...")
+            max_wait = 120  # Maximum wait time in seconds
+            wait_time = 0
+            while video_file.state.name == "PROCESSING" and wait_time < max_wait:
+                time.sleep(5)
+                wait_time += 5
+                video_file = genai.get_file(video_file.name)
+                print(f"Processing... ({wait_time}s)")
 
-        if video_file.state.name == "FAILED":
-            return {'error': f'Gemini file processing failed: {video_file.state.name}', 'analysis': None}
+            if video_file.state.name == "FAILED":
+                return {'error': f'Gemini file processing failed: {video_file.state.name}', 'analysis': None}
 
-        if video_file.state.name != "ACTIVE":
-            return {'error': f'Gemini file not ready after {max_wait}s: {video_file.state.name}', 'analysis': None}
+            if video_file.state.name != "ACTIVE":
+                return {'error': f'Gemini file not ready after {max_wait}s: {video_file.state.name}', 'analysis': None}
 
-        print(f"Video ready. State: {video_file.state.name}")
+            print(f"Video ready. State: {video_file.state.name}")
 
-        # Create the model and generate analysis
-        model = genai.GenerativeModel('gemini-2.0-flash')
+            # Create the model and generate analysis
+            model = genai.GenerativeModel('gemini-2.0-flash')
 
-        prompt = """Analyze this video in detail. Provide a comprehensive analysis covering:
+            prompt = _AUDIO_ANALYSIS_PROMPT if audio_only else """Analyze this video in detail. Provide a comprehensive analysis covering:
 
 1. **👁️ Visual Content**
 Describe what you see throughout the video - people, objects, settings, actions, transitions, visual effects, text overlays, and any on-screen graphics.
@@ -611,17 +819,20 @@ What type of content is this? (e.g., tutorial, entertainment, educational, promo
 
 Be specific and detailed in your analysis."""
 
-        print("Generating video analysis...")
-        response = model.generate_content([video_file, prompt])
-
-        # Clean up - delete the uploaded file
-        try:
-            genai.delete_file(video_file.name)
-            print("Cleaned up uploaded file")
-        except Exception as cleanup_error:
-            print(f"Warning: Failed to delete uploaded file: {cleanup_error}")
+            print("Generating video analysis...")
+            # Stream the response so text is consumed as it is generated
+            # rather than waiting for one large payload at the end. Chunks
+            # without parts (safety/finish-only) have no .text
+            response = model.generate_content([video_file, prompt], stream=True)
+            analysis_text = ''.join(chunk.text for chunk in response if chunk.parts)
+        finally:
+            # Clean up - delete the uploaded file
+            try:
+                genai.delete_file(video_file.name)
+                print("Cleaned up uploaded file")
+            except Exception as cleanup_error:
+                print(f"Warning: Failed to delete uploaded file: {cleanup_error}")
 
-        analysis_text = response.text
         print(f"Analysis complete. Length: {len(analysis_text)} chars")
 
         return {
@@ -674,92 +885,132 @@ def download_and_store(request):
         if not video_url:
             return ({'error': 'video_url is required'}, 400, headers)
 
+        # Not a with-block: its exit would join the worker even on errors
+        pool = ThreadPoolExecutor(max_workers=1)
         with tempfile.TemporaryDirectory() as tmpdir:
-            # Download video
-            video_info = download_video(video_url, tmpdir)
-
-            # Generate filename
-            filename = custom_filename or generate_smart_filename(
-                video_info['title'],
-                video_info['uploader'],
-                video_info['ext']
-            )
-
-            # Upload video to Cloud Storage
-            storage_client = get_storage_client()
-            video_file = upload_to_gcs(
-                storage_client,
-                video_info['filepath'],
-                filename
-            )
-
-            response = {
-                'success': True,
-                'video': {
-                    'file_name': filename,
-                    'public_url': video_file['public_url'],
-                    'size_bytes': video_file['size_bytes'],
-                    'blob_name': video_file['blob_name'],
-                },
-                'metadata': {
-                    'title': video_info['title'],
-                    'duration': video_info['duration'],
-                    'uploader': video_info['uploader'],
-                    'video_id': video_info['video_id'],
-                    'source': video_info['source'],
-                    'thumbnail': video_info['thumbnail'],
-                }
-            }
-
-            # Extract and upload audio if requested
-            if extract_audio_flag:
-                audio_path = extract_audio(video_info['filepath'], tmpdir)
-                if audio_path:
-                    audio_filename = filename.rsplit('.', 1)[0] + '.mp3'
-                    audio_file = upload_to_gcs(
-                        storage_client,
-                        audio_path,
-                        audio_filename
+            gemini_future = None
+            try:
+                # Download video
+                video_info = download_video(video_url, tmpdir)
+
+                # Spotify podcasts are downloaded audio-only (MP3): the media
+                # file is analyzed and validated as audio, not video
+                audio_only = (video_info['source'] == 'spotify_via_youtube'
+                              and video_info['filepath'].endswith('.mp3'))
+
+                # Start Gemini analysis right away so its upload and generation
+                # overlap with the GCS uploads and audio extraction below
+                if analyze_video_flag:
+                    gemini_future = pool.submit(
+                        analyze_video_with_gemini,
+                        video_info['filepath'],
+                        api_key=gemini_api_key,
+                        audio_only=audio_only
                     )
-                    response['audio'] = {
-                        'file_name': audio_filename,
-                        'public_url': audio_file['public_url'],
-                        'size_bytes': audio_file['size_bytes'],
-                        'blob_name': audio_file['blob_name'],
-                    }
 
-                    # Transcribe audio if requested
-                    if transcribe_audio_flag:
-                        transcription_result = transcribe_audio(
-                            audio_path,
-                            api_key=assemblyai_api_key
-                        )
-                        response['transcription'] = transcription_result
+                # Generate filename
+                filename = custom_filename or generate_smart_filename(
+                    video_info['title'],
+                    video_info['uploader'],
+                    video_info['ext']
+                )
 
-            # Analyze video with Gemini if requested
-            if analyze_video_flag:
-                gemini_result = analyze_video_with_gemini(
+                # Upload video to Cloud Storage
+                storage_client = get_storage_client()
+                video_file = upload_to_gcs(
+                    storage_client,
                     video_info['filepath'],
-                    api_key=gemini_api_key
+                    filename
                 )
-                response['gemini_analysis'] = gemini_result
-
-            # Validate that all required fields are present and non-empty
-            validation_result = validate_video_enrichment(response)
-            response['validation'] = {
-                'valid': validation_result['valid'],
-                'errors': validation_result['errors'],
-                'required_sections': REQUIRED_ANALYSIS_SECTIONS
-            }
 
-            # If validation failed, add to errors array for n8n handling
-            if not validation_result['valid']:
-                if 'errors' not in response:
-                    response['errors'] = []
-                response['errors'].extend(validation_result['errors'])
-                print(f"Validation errors: {validation_result['errors']}")
+                # 'video' holds the downloaded media file, which is the MP3
+                # itself for audio-only sources (see metadata.media_type)
+                response = {
+                    'success': True,
+                    'video': {
+                        'file_name': filename,
+                        'public_url': video_file['public_url'],
+                        'size_bytes': video_file['size_bytes'],
+                        'blob_name': video_file['blob_name'],
+                    },
+                    'metadata': {
+                        'title': video_info['title'],
+                        'duration': video_info['duration'],
+                        'uploader': video_info['uploader'],
+                        'video_id': video_info['video_id'],
+                        'source': video_info['source'],
+                        'thumbnail': video_info['thumbnail'],
+                        'media_type': 'audio' if audio_only else 'video',
+                    }
+                }
+
+                # Extract and upload audio if requested
+                if extract_audio_flag:
+                    audio_filename = filename.rsplit('.', 1)[0] + '.mp3'
+                    if audio_only:
+                        # Podcast was downloaded audio-only - no ffmpeg pass needed
+                        audio_path = video_info['filepath']
+                        if audio_filename == filename:
+                            # Same file already uploaded as the main media file
+                            audio_file = video_file
+                        else:
+                            audio_file = upload_to_gcs(
+                                storage_client,
+                                audio_path,
+                                audio_filename
+                            )
+                    else:
+                        audio_path, audio_file = extract_audio_to_gcs(
+                            storage_client,
+                            video_info['filepath'],
+                            tmpdir,
+                            audio_filename
+                        )
+                    if audio_path:
+                        response['audio'] = {
+                            'file_name': audio_filename,
+                            'public_url': audio_file['public_url'],
+                            'size_bytes': audio_file['size_bytes'],
+                            'blob_name': audio_file['blob_name'],
+                        }
+
+                        # Transcribe audio if requested
+                        if transcribe_audio_flag:
+                            transcription_result = transcribe_audio(
+                                audio_path,
+                                api_key=assemblyai_api_key
+                            )
+                            response['transcription'] = transcription_result
+
+                # Collect Gemini analysis if requested
+                if gemini_future:
+                    response['gemini_analysis'] = gemini_future.result()
+
+                # Validate that all required fields are present and non-empty
+                required_sections = REQUIRED_AUDIO_ANALYSIS_SECTIONS if audio_only else REQUIRED_ANALYSIS_SECTIONS
+                validation_result = validate_video_enrichment(response, required_sections)
+                response['validation'] = {
+                    'valid': validation_result['valid'],
+                    'errors': validation_result['errors'],
+                    'required_sections': required_sections
+                }
 
-            return (response, 200, headers)
+                # If validation failed, add to errors array for n8n handling
+                if not validation_result['valid']:
+                    if 'errors' not in response:
+                        response['errors'] = []
+                    response['errors'].extend(validation_result['errors'])
+                    print(f"Validation errors: {validation_result['errors']}")
+
+                return (response, 200, headers)
+            except Exception:
+                # Don't hold the error response until a Gemini upload or
+                # generation we no longer need has finished
+                if gemini_future:
+                    gemini_future.cancel()
+                raise
+            finally:
+                pool.shutdown(wait=False)
 
     except Exception as e:
         error_trace = traceback.format_exc()
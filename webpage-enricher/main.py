@@ -14,81 +14,288 @@ Responsibilities (per ARCHITECTURE.md):
 
 Does NOT:
 - Write to Notion (n8n's job)
-- Handle retries (n8n's job)
+- Handle retries (n8n's job; only Spotify/iTunes API calls retry transient errors)
 - Make routing decisions (n8n's job)
 """
 
 import functions_framework
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+import lxml.html
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 import re
-import json
+import orjson
 import os
-import google.generativeai as genai
-from datetime import datetime
+import time
+import base64
+import functools
+import gzip
+import hashlib
+import http.cookiejar
+import threading
+from datetime import datetime, timezone
 
 # Configuration
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 SPOTIFY_CLIENT_ID = os.environ.get('SPOTIFY_CLIENT_ID')
 SPOTIFY_CLIENT_SECRET = os.environ.get('SPOTIFY_CLIENT_SECRET')
 ASSEMBLYAI_API_KEY = os.environ.get('ASSEMBLYAI_API_KEY')
+MAX_HTML_BYTES = 1024 * 1024  # Stop downloading pages after 1 MiB
+MAX_CONTENT_CHARS = 15000  # Main content kept per page
+MAX_AI_CHARS = 10000  # Page content sent to Gemini (input tokens drive latency/cost)
+MAX_BATCH_URLS = 20  # URLs accepted per batch request
+BATCH_WORKERS = 8  # Batch URLs enriched concurrently
+GZIP_MIN_BYTES = 1024  # Smaller responses aren't worth compressing
 USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 
+# Shared HTTP session: pooled keep-alive connections across warm invocations.
+# Page and RSS fetches are never retried here (n8n retries the enrichment);
+# only the Spotify/iTunes API hosts get retry/backoff on rate limits and
+# transient server errors (GET only)
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+_API_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,
+    ),
+)
+_RETRY_HOSTS = (
+    'https://api.spotify.com',
+    'https://accounts.spotify.com',
+    'https://open.spotify.com',  # oEmbed
+    'https://itunes.apple.com',
+)
+_SESSION = requests.Session()
+# Pool connections, not state: cookies from bookmarked sites must not carry
+# over into later, unrelated enrichments
+_SESSION.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+_SESSION.mount('https://', _HTTP_ADAPTER)
+_SESSION.mount('http://', _HTTP_ADAPTER)
+for _host in _RETRY_HOSTS:
+    _SESSION.mount(_host, _API_HTTP_ADAPTER)
+
+# Background work overlapped with the request thread, shared across
+# invocations on a warm instance. Transcriptions poll AssemblyAI for minutes,
+# so they get their own pool and can't starve the (seconds-long) AI calls
+_AI_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='enrich-ai')
+_TRANSCRIPTION_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='enrich-transcribe')
+
 # Spotify API token cache
 _spotify_token_cache = {'token': None, 'expires_at': 0}
+_spotify_token_lock = threading.Lock()
+
+# Warm-instance caches for stable upstream lookups: key -> (expires_at, value)
+SPOTIFY_EPISODE_CACHE_TTL = 24 * 3600  # Episode metadata rarely changes
+ITUNES_FEED_CACHE_TTL = 7 * 24 * 3600  # Show -> RSS feed mapping is very stable
+ENRICHMENT_CACHE_TTL = 24 * 3600  # Same URL + same page body -> same enrichment
+PRODUCT_ENRICHMENT_CACHE_TTL = 3600  # Prices change more often
+CACHE_MAX_ENTRIES = 1024
+
+# Outbound rate limits per warm instance, so request bursts don't trigger
+# 429 retry storms upstream: limiter -> next free slot (monotonic clock)
+_spotify_rate_limit = {'interval': 0.1, 'next_at': 0.0, 'lock': threading.Lock()}  # ~10 req/s
+_itunes_rate_limit = {'interval': 0.2, 'next_at': 0.0, 'lock': threading.Lock()}  # ~5 req/s
+
+# RSS episode matching
+ITUNES_DURATION_TAG = '{http://www.itunes.com/dtds/podcast-1.0.dtd}duration'
+RSS_EXACT_MATCH_SCORE = 0.95  # Stop scanning the feed once a title matches this well
+_spotify_episode_cache = {}
+_itunes_feed_cache = {}
+_enrichment_cache = {}
+_cache_lock = threading.Lock()  # Batch and background threads share the caches
 
 # URL patterns for type detection
-VIDEO_PATTERNS = ['youtube.com', 'youtu.be', 'vimeo.com', 'tiktok.com', 'twitch.tv']
-SOCIAL_PATTERNS = ['twitter.com', 'x.com', 'instagram.com', 'linkedin.com/posts', 'facebook.com', 'threads.net']
-CODE_PATTERNS = ['github.com', 'gitlab.com', 'stackoverflow.com', 'codepen.io', 'jsfiddle.net', 'replit.com']
-PRODUCT_PATTERNS = ['amazon.', 'ebay.', 'etsy.com', 'shopify.', 'aliexpress.', 'walmart.com', 'target.com']
-PODCAST_PATTERNS = ['spotify.com/episode', 'podcasts.apple.com', 'overcast.fm', 'pocketcasts.com']
+VIDEO_PATTERNS = ('youtube.com', 'youtu.be', 'vimeo.com', 'tiktok.com', 'twitch.tv')
+SOCIAL_PATTERNS = ('twitter.com', 'x.com', 'instagram.com', 'linkedin.com/posts', 'facebook.com', 'threads.net')
+CODE_PATTERNS = ('github.com', 'gitlab.com', 'stackoverflow.com', 'codepen.io', 'jsfiddle.net', 'replit.com')
+PRODUCT_PATTERNS = ('amazon.', 'ebay.', 'etsy.com', 'shopify.', 'aliexpress.', 'walmart.com', 'target.com')
+PODCAST_PATTERNS = ('spotify.com/episode', 'podcasts.apple.com', 'overcast.fm', 'pocketcasts.com')
+
+# oEmbed endpoints for video hosts whose oEmbed returns title, author,
+# thumbnail, description and upload date, so it can stand in for the
+# (multi-MB) watch page. YouTube's has no description or date, so YouTube
+# pages take the HTML path instead
+OEMBED_ENDPOINTS = {
+    'vimeo.com': 'https://vimeo.com/api/oembed.json',
+}
+
+# Response bodies are returned as orjson bytes; datetimes serialise as UTC 'Z'
+_JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# Response headers, built once (never mutated; _gzip_response copies them)
+_PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'POST',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Max-Age': '3600'
+}
+_RESPONSE_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Content-Type': 'application/json',
+}
+
+# Pre-serialised bodies for the most common bad requests
+_MISSING_URL_BODY = orjson.dumps({'error': 'Missing required field: url'})
+_INVALID_URLS_BODY = orjson.dumps({'error': f'Field urls must be a list of 1-{MAX_BATCH_URLS} URL strings'})
+
+# Common response fields, in order (values are zipped in on the hot path)
+_RESPONSE_KEYS = (
+    'url', 'domain', 'type', 'title', 'author', 'published_date', 'main_image', 'description',
+    'reading_time', 'price', 'currency', 'code_snippets', 'ai_summary', 'ai_analysis', 'processed_at',
+)
+
+# Gemini structured output: responses come back as JSON matching these schemas
+_WEBPAGE_ANALYSIS_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': {
+        'type': 'object',
+        'properties': {
+            'title': {'type': 'string'},
+            'summary': {'type': 'string'},
+            'analysis': {'type': 'string'},
+        },
+        'required': ['title', 'summary', 'analysis'],
+    },
+}
+_PODCAST_ANALYSIS_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': {
+        'type': 'object',
+        'properties': {
+            'summary': {'type': 'string'},
+            'analysis': {'type': 'string'},
+        },
+        'required': ['summary', 'analysis'],
+    },
+}
+
+# Precompiled patterns (avoid per-request regex compilation/cache lookups)
+_SPOTIFY_RE = re.compile(r'spotify\.com/episode/([a-zA-Z0-9]+)')
+_ADD_TO_CART_RE = re.compile(r'\b(?:add to cart|buy now|purchase)\b', re.I)
+_RAW_TEXT_TAG_RE = re.compile(r'(?:script|style)\b', re.I)
+_BY_RE = re.compile(r'^by\s+', re.I)
+_PRICE_NUM_RE = re.compile(r'[\$\£\€]?\s*(\d+(?:[.,]\d{2})?)')
+
+# Precompiled XPath queries over the parsed page (evaluated in libxml2).
+# Case-insensitive substring tests use translate() to stay in C.
+_LOWER = "'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'"
+_CLASS_L = f"translate(@class, {_LOWER})"
+_SKIPPED_TAGS = 'self::script or self::style or self::nav or self::footer or self::header or self::aside or self::noscript'
+
+_HAS_PRICE_CLASS_XPATH = etree.XPath(
+    f"boolean(//*[contains({_CLASS_L}, 'price') or contains({_CLASS_L}, 'cost') or contains({_CLASS_L}, 'amount')])")
+_VISIBLE_TEXT_XPATH = etree.XPath('//text()[not(ancestor::script or ancestor::style)]', smart_strings=False)
+_CODE_BLOCKS_XPATH = etree.XPath('//pre | //code')
+_CODE_BLOCK_COUNT_XPATH = etree.XPath('count(//pre | //code)')
+_META_XPATH = etree.XPath('//meta[@content][@property or @name]')
+_TITLE_XPATH = etree.XPath('(//title)[1]')
+_H1_XPATH = etree.XPath('(//h1)[1]')
+_AUTHOR_LINK_XPATH = etree.XPath("(//a[contains(concat(' ', normalize-space(@rel), ' '), ' author ')])[1]")
+_AUTHOR_CLASS_XPATH = etree.XPath(f"(//*[contains({_CLASS_L}, 'author') or contains({_CLASS_L}, 'byline')])[1]")
+_TIME_DATETIME_XPATH = etree.XPath('(//time[@datetime])[1]/@datetime', smart_strings=False)
+_CONTENT_CONTAINER_XPATHS = (
+    etree.XPath(f'(//article[not(ancestor-or-self::*[{_SKIPPED_TAGS}])])[1]'),
+    etree.XPath(f'(//main[not(ancestor-or-self::*[{_SKIPPED_TAGS}])])[1]'),
+    etree.XPath(
+        f"(//*[contains({_CLASS_L}, 'content') or contains({_CLASS_L}, 'post') or contains({_CLASS_L}, 'article')"
+        f" or contains({_CLASS_L}, 'entry')][not(ancestor-or-self::*[{_SKIPPED_TAGS}])])[1]"),
+    etree.XPath('(//body)[1]'),
+)
+_CONTENT_TEXT_XPATH = etree.XPath(f'.//text()[not(ancestor::*[{_SKIPPED_TAGS}])]', smart_strings=False)
+_PRICE_ELEMENT_XPATHS = (
+    etree.XPath(f"(//*[contains({_CLASS_L}, 'price')])[1]"),
+    etree.XPath("(//*[@itemprop='price'])[1]"),
+    etree.XPath('(//*[@data-price])[1]'),
+)
+
+
+def _cache_get(cache: dict, key: str):
+    """Return a cached value, or None if missing or expired."""
+    entry = cache.get(key)
+    if entry and time.time() < entry[0]:
+        return entry[1]
+    return None
+
+
+def _cache_set(cache: dict, key: str, value, ttl: int) -> None:
+    """Store a value with a TTL, evicting the oldest entry when full."""
+    with _cache_lock:
+        if key not in cache and len(cache) >= CACHE_MAX_ENTRIES:
+            cache.pop(next(iter(cache)))
+        cache[key] = (time.time() + ttl, value)
+
+
+def _throttle(limiter: dict) -> None:
+    """Block until the limiter has a free slot, then reserve it."""
+    with limiter['lock']:
+        now = time.monotonic()
+        wait = limiter['next_at'] - now
+        limiter['next_at'] = max(now, limiter['next_at']) + limiter['interval']
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _spotify_cached_token() -> str:
+    """Return the cached Spotify token if it is still valid."""
+    if _spotify_token_cache['token'] and time.time() < _spotify_token_cache['expires_at']:
+        return _spotify_token_cache['token']
+    return None
 
 
 def get_spotify_access_token() -> str:
     """Get Spotify API access token using Client Credentials flow."""
-    import time
-
-    # Check cache first
-    if _spotify_token_cache['token'] and time.time() < _spotify_token_cache['expires_at']:
-        return _spotify_token_cache['token']
+    # Fast path: no locking while the cached token is valid
+    token = _spotify_cached_token()
+    if token:
+        return token
 
     if not SPOTIFY_CLIENT_ID or not SPOTIFY_CLIENT_SECRET:
         return None
 
-    try:
-        import base64
-        auth_string = f"{SPOTIFY_CLIENT_ID}:{SPOTIFY_CLIENT_SECRET}"
-        auth_bytes = base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
-
-        response = requests.post(
-            'https://accounts.spotify.com/api/token',
-            headers={
-                'Authorization': f'Basic {auth_bytes}',
-                'Content-Type': 'application/x-www-form-urlencoded'
-            },
-            data={'grant_type': 'client_credentials'},
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        # Cache the token (expires_in is typically 3600 seconds)
-        _spotify_token_cache['token'] = data['access_token']
-        _spotify_token_cache['expires_at'] = time.time() + data.get('expires_in', 3600) - 60  # 60s buffer
+    with _spotify_token_lock:
+        # Another thread may have refreshed the token while we waited
+        token = _spotify_cached_token()
+        if token:
+            return token
 
-        return data['access_token']
-    except Exception as e:
-        print(f"Spotify auth error: {e}")
-        return None
+        try:
+            auth_string = f"{SPOTIFY_CLIENT_ID}:{SPOTIFY_CLIENT_SECRET}"
+            auth_bytes = base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
+
+            _throttle(_spotify_rate_limit)
+            response = _SESSION.post(
+                'https://accounts.spotify.com/api/token',
+                headers={
+                    'Authorization': f'Basic {auth_bytes}',
+                    'Content-Type': 'application/x-www-form-urlencoded'
+                },
+                data={'grant_type': 'client_credentials'},
+                timeout=10
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+
+            # Cache the token (expires_in is typically 3600 seconds)
+            _spotify_token_cache['token'] = data['access_token']
+            _spotify_token_cache['expires_at'] = time.time() + data.get('expires_in', 3600) - 60  # 60s buffer
+
+            return data['access_token']
+        except Exception as e:
+            print(f"Spotify auth error: {e}")
+            return None
 
 
 def extract_spotify_episode_id(url: str) -> str:
     """Extract episode ID from Spotify URL."""
-    import re
     # Matches: open.spotify.com/episode/XXXXXX or spotify.com/episode/XXXXXX
-    match = re.search(r'spotify\.com/episode/([a-zA-Z0-9]+)', url)
+    match = _SPOTIFY_RE.search(url)
     return match.group(1) if match else None
 
 
@@ -98,19 +305,24 @@ def fetch_spotify_episode(url: str) -> dict:
     if not episode_id:
         return {'success': False, 'error': 'Could not extract episode ID from URL'}
 
+    cached = _cache_get(_spotify_episode_cache, episode_id)
+    if cached:
+        return cached
+
     token = get_spotify_access_token()
     if not token:
         # Fall back to oEmbed if no API credentials
         return fetch_spotify_oembed(url)
 
     try:
-        response = requests.get(
+        _throttle(_spotify_rate_limit)
+        response = _SESSION.get(
             f'https://api.spotify.com/v1/episodes/{episode_id}',
             headers={'Authorization': f'Bearer {token}'},
             timeout=10
         )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Extract show info
         show = data.get('show', {})
@@ -119,7 +331,7 @@ def fetch_spotify_episode(url: str) -> dict:
         duration_ms = data.get('duration_ms', 0)
         duration_minutes = round(duration_ms / 60000) if duration_ms else None
 
-        return {
+        result = {
             'success': True,
             'title': data.get('name'),
             'description': data.get('description') or data.get('html_description'),
@@ -135,6 +347,8 @@ def fetch_spotify_episode(url: str) -> dict:
             'type': 'podcast',
             'provider_name': 'Spotify'
         }
+        _cache_set(_spotify_episode_cache, episode_id, result, SPOTIFY_EPISODE_CACHE_TTL)
+        return result
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 404:
             return {'success': False, 'error': 'Episode not found'}
@@ -149,9 +363,10 @@ def fetch_spotify_oembed(url: str) -> dict:
     """Fetch metadata from Spotify oEmbed API for podcast episodes (fallback)."""
     try:
         oembed_url = f"https://open.spotify.com/oembed?url={url}"
-        response = requests.get(oembed_url, timeout=10)
+        _throttle(_spotify_rate_limit)
+        response = _SESSION.get(oembed_url, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         return {
             'title': data.get('title'),
@@ -166,11 +381,17 @@ def fetch_spotify_oembed(url: str) -> dict:
 
 def search_podcast_itunes(show_name: str) -> dict:
     """Search for a podcast's RSS feed using the iTunes Search API."""
+    cache_key = show_name.lower()
+    cached = _cache_get(_itunes_feed_cache, cache_key)
+    if cached:
+        return cached
+
     try:
         # Clean up show name for search
         search_term = show_name.replace("'", "").replace('"', '')
 
-        response = requests.get(
+        _throttle(_itunes_rate_limit)
+        response = _SESSION.get(
             'https://itunes.apple.com/search',
             params={
                 'term': search_term,
@@ -180,7 +401,7 @@ def search_podcast_itunes(show_name: str) -> dict:
             timeout=10
         )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         results = data.get('results', [])
         if not results:
@@ -197,118 +418,144 @@ def search_podcast_itunes(show_name: str) -> dict:
         if not best_match:
             best_match = results[0]
 
-        return {
+        result = {
             'success': True,
             'rss_url': best_match.get('feedUrl'),
             'podcast_name': best_match.get('collectionName'),
             'artist_name': best_match.get('artistName'),
             'artwork_url': best_match.get('artworkUrl600')
         }
+        _cache_set(_itunes_feed_cache, cache_key, result, ITUNES_FEED_CACHE_TTL)
+        return result
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
-def find_episode_in_rss(rss_url: str, episode_title: str, duration_minutes: int = None) -> dict:
-    """Find a specific episode in an RSS feed and return its audio URL."""
-    import feedparser
-    from difflib import SequenceMatcher
-
+def _parse_itunes_duration(value: str) -> int:
+    """Convert an itunes:duration value (HH:MM:SS, MM:SS or seconds) to minutes."""
+    if not value:
+        return None
+    value = value.strip()
     try:
-        # Parse RSS feed
-        feed = feedparser.parse(rss_url)
+        if ':' in value:
+            parts = value.split(':')
+            if len(parts) == 2:
+                return int(parts[0])
+            if len(parts) == 3:
+                return int(parts[0]) * 60 + int(parts[1])
+            return None
+        return int(value) // 60
+    except ValueError:
+        return None
 
-        if not feed.entries:
-            return {'success': False, 'error': 'No episodes found in RSS feed'}
 
+def find_episode_in_rss(rss_url: str, episode_title: str, duration_minutes: int = None) -> dict:
+    """Find a specific episode in an RSS feed and return its audio URL.
+
+    The feed is streamed and parsed item by item, so large feeds are never
+    held in memory and parsing stops early on a near-exact title match.
+    """
+    from rapidfuzz import fuzz
+
+    try:
         # Normalize search title
         search_title = episode_title.lower().strip()
 
         best_match = None
         best_score = 0
+        items_seen = 0
+
+        with _SESSION.get(rss_url, headers={'User-Agent': USER_AGENT}, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True  # Let urllib3 handle gzip/deflate
+
+            for _, item in etree.iterparse(response.raw, tag='item', recover=True, resolve_entities=False):
+                items_seen += 1
+                entry_title = (item.findtext('title') or '').strip()
+
+                # Calculate similarity score (same 0-1 ratio as difflib, computed in C)
+                title_score = fuzz.ratio(search_title, entry_title.lower()) / 100
+                score = title_score
+
+                # Boost score if duration matches (within 2 minutes)
+                if duration_minutes:
+                    entry_duration = _parse_itunes_duration(item.findtext(ITUNES_DURATION_TAG))
+                    if entry_duration and abs(entry_duration - duration_minutes) <= 2:
+                        score += 0.2  # Boost for matching duration
+
+                if score > best_score:
+                    # Extract audio URL from enclosures
+                    audio_url = None
+                    for enclosure in item.iterfind('enclosure'):
+                        if (enclosure.get('type') or '').startswith('audio/'):
+                            audio_url = enclosure.get('url')
+                            break
+
+                    best_score = score
+                    best_match = {'title': entry_title, 'audio_url': audio_url}
+
+                # Free processed items so memory stays flat on long feeds
+                item.clear()
+                while item.getprevious() is not None:
+                    del item.getparent()[0]
+
+                if title_score >= RSS_EXACT_MATCH_SCORE:
+                    break
 
-        for entry in feed.entries:
-            entry_title = entry.get('title', '').lower().strip()
-
-            # Calculate similarity score
-            score = SequenceMatcher(None, search_title, entry_title).ratio()
-
-            # Boost score if duration matches (within 2 minutes)
-            if duration_minutes:
-                entry_duration = None
-                # Try to get duration from itunes:duration
-                if hasattr(entry, 'itunes_duration'):
-                    dur = entry.itunes_duration
-                    if ':' in str(dur):
-                        parts = str(dur).split(':')
-                        if len(parts) == 2:
-                            entry_duration = int(parts[0])
-                        elif len(parts) == 3:
-                            entry_duration = int(parts[0]) * 60 + int(parts[1])
-                    else:
-                        try:
-                            entry_duration = int(dur) // 60
-                        except:
-                            pass
-
-                if entry_duration and abs(entry_duration - duration_minutes) <= 2:
-                    score += 0.2  # Boost for matching duration
-
-            if score > best_score:
-                best_score = score
-                best_match = entry
+        if not items_seen:
+            return {'success': False, 'error': 'No episodes found in RSS feed'}
 
         # Require at least 50% match
         if best_score < 0.5:
             return {'success': False, 'error': f'No matching episode found (best score: {best_score:.2f})'}
 
-        # Extract audio URL from enclosures
-        audio_url = None
-        if best_match.get('enclosures'):
-            for enc in best_match.enclosures:
-                if enc.get('type', '').startswith('audio/'):
-                    audio_url = enc.get('href') or enc.get('url')
-                    break
-
-        # Fallback to links
-        if not audio_url and best_match.get('links'):
-            for link in best_match.links:
-                if link.get('type', '').startswith('audio/'):
-                    audio_url = link.get('href')
-                    break
-
-        if not audio_url:
+        if not best_match['audio_url']:
             return {'success': False, 'error': 'No audio URL found in episode'}
 
         return {
             'success': True,
-            'audio_url': audio_url,
-            'episode_title': best_match.get('title'),
+            'audio_url': best_match['audio_url'],
+            'episode_title': best_match['title'],
             'match_score': best_score
         }
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
-def transcribe_audio_url(audio_url: str) -> dict:
-    """Transcribe audio from URL using AssemblyAI."""
-    if not ASSEMBLYAI_API_KEY:
-        return {'success': False, 'error': 'ASSEMBLYAI_API_KEY not configured'}
+_aai_transcriber = None
 
-    try:
-        import assemblyai as aai
 
-        aai.settings.api_key = ASSEMBLYAI_API_KEY
+def _get_transcriber():
+    """Return the shared AssemblyAI transcriber, creating it on first use.
+
+    The transcriber owns an HTTP client, so reusing it keeps connections
+    alive between invocations on a warm instance.
+    """
+    global _aai_transcriber
+    if _aai_transcriber is None:
+        import assemblyai as aai
 
-        # Configure transcription
         config = aai.TranscriptionConfig(
             speech_model=aai.SpeechModel.best,
             punctuate=True,
             format_text=True,
         )
+        # Explicit client: older assemblyai releases (down to the pinned
+        # 0.35) have no api_key argument on Transcriber
+        client = aai.Client(settings=aai.Settings(api_key=ASSEMBLYAI_API_KEY))
+        _aai_transcriber = aai.Transcriber(client=client, config=config)
+    return _aai_transcriber
+
+
+def transcribe_audio_url(audio_url: str) -> dict:
+    """Transcribe audio from URL using AssemblyAI."""
+    if not ASSEMBLYAI_API_KEY:
+        return {'success': False, 'error': 'ASSEMBLYAI_API_KEY not configured'}
 
-        # Create transcriber and transcribe
-        transcriber = aai.Transcriber(config=config)
-        transcript = transcriber.transcribe(audio_url)
+    try:
+        import assemblyai as aai
+
+        transcript = _get_transcriber().transcribe(audio_url)
 
         if transcript.status == aai.TranscriptStatus.error:
             return {'success': False, 'error': transcript.error}
@@ -323,49 +570,195 @@ def transcribe_audio_url(audio_url: str) -> dict:
         return {'success': False, 'error': str(e)}
 
 
-def detect_content_type(url: str, soup: BeautifulSoup) -> str:
-    """Detect the type of content based on URL and page content."""
-    domain = urlparse(url).netloc.lower()
+def transcribe_spotify_episode(spotify_data: dict) -> tuple:
+    """Transcribe a Spotify episode via its public RSS feed.
 
-    # Check URL patterns first
-    for pattern in VIDEO_PATTERNS:
-        if pattern in domain:
-            return 'video'
+    Finds the feed through iTunes, matches the episode and transcribes the
+    audio enclosure. Returns (transcription, error).
+    """
+    if not (spotify_data.get('show_name') and spotify_data.get('title')):
+        return None, None
+
+    # Step 1: Find RSS feed via iTunes
+    rss_result = search_podcast_itunes(spotify_data['show_name'])
+    if not (rss_result.get('success') and rss_result.get('rss_url')):
+        return None, f"RSS feed not found: {rss_result.get('error')}"
+
+    # Step 2: Find episode in RSS
+    episode_result = find_episode_in_rss(
+        rss_result['rss_url'],
+        spotify_data['title'],
+        spotify_data.get('duration_minutes')
+    )
+    if not (episode_result.get('success') and episode_result.get('audio_url')):
+        return None, f"Episode not found in RSS: {episode_result.get('error')}"
 
-    for pattern in PODCAST_PATTERNS:
-        if pattern in url.lower():
-            return 'podcast'
+    # Step 3: Transcribe audio
+    transcription_result = transcribe_audio_url(episode_result['audio_url'])
+    if not transcription_result.get('success'):
+        return None, f"Transcription failed: {transcription_result.get('error')}"
 
-    for pattern in SOCIAL_PATTERNS:
-        if pattern in domain:
-            return 'social'
+    return transcription_result.get('text'), None
 
-    for pattern in CODE_PATTERNS:
-        if pattern in domain:
-            return 'code'
 
-    for pattern in PRODUCT_PATTERNS:
-        if pattern in domain:
-            return 'product'
+def fetch_video_oembed(url: str, domain: str) -> dict:
+    """Fetch video metadata from the host's oEmbed API (see OEMBED_ENDPOINTS)."""
+    endpoint = next((e for host, e in OEMBED_ENDPOINTS.items() if host in domain), None)
+    if not endpoint:
+        return {'success': False, 'error': 'No oEmbed endpoint for domain'}
+
+    try:
+        response = _SESSION.get(endpoint, params={'url': url, 'format': 'json'}, timeout=10)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        return {
+            'title': data.get('title'),
+            'author_name': data.get('author_name'),
+            'thumbnail_url': data.get('thumbnail_url'),
+            'provider_name': data.get('provider_name'),
+            'description': data.get('description'),
+            'upload_date': data.get('upload_date'),
+            'success': True
+        }
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+
+def _classify_url(url_l: str, domain: str) -> str:
+    """Classify a lower-cased URL by its patterns alone, or None if unknown."""
+    if any(p in domain for p in VIDEO_PATTERNS):
+        return 'video'
+    if any(p in url_l for p in PODCAST_PATTERNS):
+        return 'podcast'
+    if any(p in domain for p in SOCIAL_PATTERNS):
+        return 'social'
+    if any(p in domain for p in CODE_PATTERNS):
+        return 'code'
+    if any(p in domain for p in PRODUCT_PATTERNS):
+        return 'product'
+    return None
+
+
+_parser_local = threading.local()
+
+
+def _html_parser():
+    """Return this thread's lxml HTML parser (parsers can't be shared across threads).
+
+    Comments and whitespace-only text nodes are dropped at parse time; no
+    extractor uses them, and the smaller tree is cheaper to query.
+    """
+    parser = getattr(_parser_local, 'parser', None)
+    if parser is None:
+        parser = _parser_local.parser = lxml.html.HTMLParser(
+            encoding='utf-8', remove_comments=True, remove_blank_text=True)
+    return parser
+
+
+def parse_html(html: str):
+    """Parse a page into an lxml tree, or None if there is nothing to parse.
+
+    The text is handed to libxml2 as UTF-8 bytes so that pages starting with
+    an XML encoding declaration parse as well.
+    """
+    try:
+        return lxml.html.document_fromstring(html.encode('utf-8'), parser=_html_parser())
+    except etree.ParserError:
+        return None
+
+
+def _element_text(element) -> str:
+    """Concatenated, stripped text of an element."""
+    return ''.join(t.strip() for t in element.itertext())
+
+
+def _html_has_add_to_cart(html: str) -> bool:
+    """True if a purchase phrase appears as whole words in the page text.
+
+    One regex pass over the raw html; each hit is checked against the
+    nearest preceding '<' so attribute values and script/style bodies don't
+    count. Only the gap since the previous hit is scanned back over, which
+    keeps the check linear in the page size.
+    """
+    tag_start = -1  # Last '<' before the current hit
+    tag_closed = True  # Whether a '>' follows tag_start before the hit
+    pos = 0
+    for match in _ADD_TO_CART_RE.finditer(html):
+        start = match.start()
+        lt = html.rfind('<', pos, start)
+        if lt != -1:
+            tag_start, tag_closed, pos = lt, False, lt
+        if not tag_closed:
+            tag_closed = html.find('>', pos, start) != -1
+        pos = start
+        if tag_closed and (tag_start == -1 or not _RAW_TEXT_TAG_RE.match(html, tag_start + 1)):
+            return True
+    return False
+
+
+def detect_content_type(url: str, tree, html: str = None, domain: str = None) -> str:
+    """Detect the type of content based on URL and page content.
+
+    When the raw html is given, purchase-button text is searched for with a
+    single regex pass over it instead of walking every text node in the tree.
+    Callers that already parsed the URL can pass its lower-cased domain.
+    """
+    url_l = url.lower()
+    if domain is None:
+        domain = urlparse(url_l).netloc
+
+    # Check URL patterns first
+    url_type = _classify_url(url_l, domain)
+    if url_type:
+        return url_type
 
     # Check page content for product indicators
-    if soup:
+    if tree is not None:
         # Look for price indicators
-        price_patterns = soup.find_all(attrs={'class': re.compile(r'price|cost|amount', re.I)})
-        add_to_cart = soup.find_all(text=re.compile(r'add to cart|buy now|purchase', re.I))
-        if price_patterns or add_to_cart:
+        if _HAS_PRICE_CLASS_XPATH(tree):
+            return 'product'
+        if html is not None:
+            add_to_cart = _html_has_add_to_cart(html)
+        else:
+            add_to_cart = any(_ADD_TO_CART_RE.search(t) for t in _VISIBLE_TEXT_XPATH(tree))
+        if add_to_cart:
             return 'product'
 
         # Look for code blocks
-        code_blocks = soup.find_all(['pre', 'code'])
-        if len(code_blocks) > 3:
+        if _CODE_BLOCK_COUNT_XPATH(tree) > 3:
             return 'code'
 
     return 'article'
 
 
-def extract_metadata(url: str, soup: BeautifulSoup) -> dict:
-    """Extract metadata from the webpage."""
+def collect_meta_tags(tree) -> dict:
+    """Collect all <meta> tags in one pass, keyed by property/name (first wins)."""
+    metas = {}
+    if tree is None:
+        return metas
+
+    for meta in _META_XPATH(tree):
+        key = meta.get('property') or meta.get('name')
+        if key:
+            metas.setdefault(key.lower(), meta.get('content'))
+    return metas
+
+
+def extract_title(tree, metas: dict) -> str:
+    """Extract the page title, trying multiple sources."""
+    title = metas.get('og:title') or metas.get('twitter:title')
+    if not title and tree is not None:
+        title_tags = _TITLE_XPATH(tree) or _H1_XPATH(tree)
+        title = _element_text(title_tags[0]) if title_tags else None
+    return title
+
+
+def extract_metadata(url: str, tree, metas: dict = None) -> dict:
+    """Extract metadata from the webpage.
+
+    Callers that already collected the <meta> tags can pass them in.
+    """
     metadata = {
         'title': None,
         'author': None,
@@ -374,138 +767,94 @@ def extract_metadata(url: str, soup: BeautifulSoup) -> dict:
         'description': None,
     }
 
-    if not soup:
+    if tree is None:
         return metadata
 
-    # Title - try multiple sources
-    og_title = soup.find('meta', property='og:title')
-    twitter_title = soup.find('meta', attrs={'name': 'twitter:title'})
-    title_tag = soup.find('title')
-    h1_tag = soup.find('h1')
-
-    metadata['title'] = (
-        og_title.get('content') if og_title else
-        twitter_title.get('content') if twitter_title else
-        title_tag.get_text(strip=True) if title_tag else
-        h1_tag.get_text(strip=True) if h1_tag else
-        None
-    )
+    if metas is None:
+        metas = collect_meta_tags(tree)
+
+    # Title
+    metadata['title'] = extract_title(tree, metas)
 
     # Author
-    author_meta = soup.find('meta', attrs={'name': 'author'})
-    author_prop = soup.find('meta', property='article:author')
-    author_rel = soup.find('a', rel='author')
-    author_class = soup.find(attrs={'class': re.compile(r'author|byline', re.I)})
-
-    metadata['author'] = (
-        author_meta.get('content') if author_meta else
-        author_prop.get('content') if author_prop else
-        author_rel.get_text(strip=True) if author_rel else
-        author_class.get_text(strip=True) if author_class else
-        None
-    )
+    author = metas.get('author') or metas.get('article:author')
+    if not author:
+        author_tags = _AUTHOR_LINK_XPATH(tree) or _AUTHOR_CLASS_XPATH(tree)
+        author = _element_text(author_tags[0]) if author_tags else None
+    metadata['author'] = author
 
     # Clean up author if found
     if metadata['author']:
-        metadata['author'] = re.sub(r'^by\s+', '', metadata['author'], flags=re.I).strip()
+        metadata['author'] = _BY_RE.sub('', metadata['author']).strip()
 
     # Published date
-    date_meta = soup.find('meta', property='article:published_time')
-    date_time = soup.find('time', attrs={'datetime': True})
-
-    date_str = (
-        date_meta.get('content') if date_meta else
-        date_time.get('datetime') if date_time else
-        None
-    )
+    date_str = metas.get('article:published_time')
+    if not date_str:
+        date_times = _TIME_DATETIME_XPATH(tree)
+        date_str = date_times[0] if date_times else None
 
     if date_str:
-        try:
-            # Parse ISO format
-            metadata['published_date'] = date_str[:10]  # Just YYYY-MM-DD
-        except:
-            pass
+        metadata['published_date'] = date_str[:10]  # Just YYYY-MM-DD
 
     # Main image
-    og_image = soup.find('meta', property='og:image')
-    twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
-
-    metadata['main_image'] = (
-        og_image.get('content') if og_image else
-        twitter_image.get('content') if twitter_image else
-        None
-    )
+    metadata['main_image'] = metas.get('og:image') or metas.get('twitter:image')
 
     # Description
-    og_desc = soup.find('meta', property='og:description')
-    meta_desc = soup.find('meta', attrs={'name': 'description'})
-
-    metadata['description'] = (
-        og_desc.get('content') if og_desc else
-        meta_desc.get('content') if meta_desc else
-        None
-    )
+    metadata['description'] = metas.get('og:description') or metas.get('description')
 
     return metadata
 
 
-def extract_main_content(soup: BeautifulSoup) -> str:
-    """Extract the main text content from the page."""
-    if not soup:
-        return ""
+def extract_main_content(tree) -> tuple:
+    """Extract the main text content from the page. Returns (text, word_count).
 
-    # Remove script, style, nav, footer, header elements
-    for element in soup.find_all(['script', 'style', 'nav', 'footer', 'header', 'aside', 'noscript']):
-        element.decompose()
+    Text inside script, style, nav, footer, header, aside and noscript
+    elements is skipped by the XPath itself, so the tree is left untouched.
+    """
+    if tree is None:
+        return "", 0
 
     # Try to find main content area
-    main_content = (
-        soup.find('article') or
-        soup.find('main') or
-        soup.find(attrs={'class': re.compile(r'content|post|article|entry', re.I)}) or
-        soup.find('body')
-    )
-
-    if main_content:
-        text = main_content.get_text(separator=' ', strip=True)
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)
-        return text[:15000]  # Limit to ~15k chars for AI processing
-
-    return ""
-
-
-def calculate_reading_time(text: str) -> int:
-    """Calculate estimated reading time in minutes."""
-    if not text:
+    for container_xpath in _CONTENT_CONTAINER_XPATHS:
+        containers = container_xpath(tree)
+        if containers:
+            break
+    else:
+        return "", 0
+
+    text = ' '.join(filter(None, map(str.strip, _CONTENT_TEXT_XPATH(containers[0]))))
+    # Collapse whitespace on a bounded prefix only (C-level split/join),
+    # then limit to ~15k chars for AI processing
+    text = ' '.join(text[:MAX_CONTENT_CHARS * 4].split())
+    text = text[:MAX_CONTENT_CHARS].rstrip()
+    # Words are now separated by exactly one space
+    word_count = text.count(' ') + 1 if text else 0
+    return text, word_count
+
+
+def reading_time_for_words(word_count: int) -> int:
+    """Calculate estimated reading time in minutes from a word count."""
+    if not word_count:
         return 0
 
     # Average reading speed: 200-250 words per minute
-    word_count = len(text.split())
-    reading_time = max(1, round(word_count / 225))
-    return reading_time
+    return max(1, round(word_count / 225))
 
 
-def extract_price(soup: BeautifulSoup) -> dict:
+def extract_price(tree) -> dict:
     """Extract price information from product pages."""
     result = {'price': None, 'currency': None}
 
-    if not soup:
+    if tree is None:
         return result
 
-    # Common price patterns
-    price_selectors = [
-        {'class': re.compile(r'price', re.I)},
-        {'itemprop': 'price'},
-        {'data-price': True},
-    ]
-
-    for selector in price_selectors:
-        element = soup.find(attrs=selector)
-        if element:
-            text = element.get_text(strip=True)
+    # Common price patterns: class containing "price", itemprop, data-price
+    for price_xpath in _PRICE_ELEMENT_XPATHS:
+        elements = price_xpath(tree)
+        if elements:
+            text = _element_text(elements[0])
             # Extract price with regex
-            match = re.search(r'[\$\£\€]?\s*(\d+(?:[.,]\d{2})?)', text)
+            match = _PRICE_NUM_RE.search(text)
             if match:
                 price_str = match.group(1).replace(',', '.')
                 try:
@@ -526,21 +875,19 @@ def extract_price(soup: BeautifulSoup) -> dict:
     return result
 
 
-def extract_code_snippets(soup: BeautifulSoup) -> list:
+def extract_code_snippets(tree) -> list:
     """Extract code snippets from the page."""
     snippets = []
 
-    if not soup:
+    if tree is None:
         return snippets
 
-    # Find code blocks
-    code_blocks = soup.find_all(['pre', 'code'])
-
-    for block in code_blocks:
-        code = block.get_text(strip=True)
+    # Find code blocks, stopping once we have enough
+    for block in _CODE_BLOCKS_XPATH(tree):
+        code = _element_text(block)
         if len(code) > 20 and len(code) < 5000:  # Reasonable code block size
             # Detect language from class
-            classes = block.get('class', [])
+            classes = block.get('class', '').split()
             language = None
             for cls in classes:
                 if 'language-' in cls:
@@ -551,8 +898,77 @@ def extract_code_snippets(soup: BeautifulSoup) -> list:
                 'code': code[:2000],  # Limit size
                 'language': language
             })
+            if len(snippets) == 5:  # Max 5 snippets
+                break
+
+    return snippets
+
+
+def _article_extras(tree, word_count: int, extract_code: bool) -> dict:
+    return {'reading_time': reading_time_for_words(word_count)}
+
+
+def _product_extras(tree, word_count: int, extract_code: bool) -> dict:
+    return extract_price(tree)
+
+
+def _code_extras(tree, word_count: int, extract_code: bool) -> dict:
+    return {'code_snippets': extract_code_snippets(tree) if extract_code else []}
+
+
+# Type-specific response fields: content type -> extractor returning the
+# fields it fills in (everything else keeps its empty default)
+_TYPE_EXTRACTORS = {
+    'article': _article_extras,
+    'product': _product_extras,
+    'code': _code_extras,
+}
+
+
+_gemini_model = None
 
-    return snippets[:5]  # Max 5 snippets
+
+def _get_gemini_model():
+    """Return the shared Gemini model, configuring the SDK on first use.
+
+    The SDK is imported here rather than at module load: it takes ~0.5s to
+    import, which cold starts would otherwise pay even for skip_ai requests.
+    """
+    global _gemini_model
+    if _gemini_model is None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=GEMINI_API_KEY)
+        _gemini_model = genai.GenerativeModel('gemini-2.0-flash')
+    return _gemini_model
+
+
+def generate_podcast_analysis(content_for_ai: str) -> dict:
+    """Generate summary and analysis for a podcast episode using Gemini."""
+    result = {'summary': None, 'analysis': None}
+
+    try:
+        model = _get_gemini_model()
+        prompt = f"""Analyze this podcast episode:
+
+{content_for_ai}
+
+Platform: Spotify
+
+Provide:
+1. A 2-3 sentence summary of what this episode covers
+2. Key topics and who would find this useful
+
+Respond in this exact JSON format (both values must be plain text strings, not arrays or objects):
+{{"summary": "Your 2-3 sentence summary here", "analysis": "Key topics: topic1, topic2, topic3. Target audience: description of who would find this useful."}}"""
+        response = model.generate_content(prompt, generation_config=_PODCAST_ANALYSIS_CONFIG)
+        parsed = orjson.loads(response.text)
+        result['summary'] = parsed.get('summary')
+        result['analysis'] = parsed.get('analysis')
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
 
 
 def generate_ai_analysis(url: str, title: str, content: str, content_type: str) -> dict:
@@ -572,9 +988,12 @@ def generate_ai_analysis(url: str, title: str, content: str, content_type: str)
         result['error'] = 'Insufficient content for analysis'
         return result
 
+    # Cut the page text to the AI budget, snapped back to a word boundary
+    if len(content) > MAX_AI_CHARS:
+        content = content[:MAX_AI_CHARS].rsplit(' ', 1)[0]
+
     try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel('gemini-2.0-flash')
+        model = _get_gemini_model()
 
         prompt = f"""Analyze this webpage and provide:
 
@@ -593,7 +1012,7 @@ Raw Title: {title}
 Content Type: {content_type}
 
 Page Content:
-{content[:10000]}
+{content}
 
 Respond in this exact JSON format:
 {{
@@ -603,19 +1022,11 @@ Respond in this exact JSON format:
 }}
 """
 
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
-
-        # Extract JSON from response
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        if json_match:
-            parsed = json.loads(json_match.group())
-            result['title'] = parsed.get('title') or title
-            result['summary'] = parsed.get('summary')
-            result['analysis'] = parsed.get('analysis')
-        else:
-            # Fallback: use whole response as analysis
-            result['analysis'] = response_text
+        response = model.generate_content(prompt, generation_config=_WEBPAGE_ANALYSIS_CONFIG)
+        parsed = orjson.loads(response.text)
+        result['title'] = parsed.get('title') or title
+        result['summary'] = parsed.get('summary')
+        result['analysis'] = parsed.get('analysis')
 
     except Exception as e:
         result['error'] = str(e)
@@ -624,7 +1035,11 @@ Respond in this exact JSON format:
 
 
 def fetch_webpage(url: str) -> tuple:
-    """Fetch webpage content. Returns (html, error)."""
+    """Fetch webpage content. Returns (html, error).
+
+    Only the first MAX_HTML_BYTES of the body are downloaded; everything we
+    extract (metadata, content truncated to 15k chars) lives well within it.
+    """
     try:
         headers = {
             'User-Agent': USER_AGENT,
@@ -632,10 +1047,28 @@ def fetch_webpage(url: str) -> tuple:
             'Accept-Language': 'en-US,en;q=0.5',
         }
 
-        response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
-        response.raise_for_status()
+        with _SESSION.get(url, headers=headers, timeout=30, allow_redirects=True, stream=True) as response:
+            response.raise_for_status()
+
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=65536):
+                body += chunk
+                if len(body) >= MAX_HTML_BYTES:
+                    # Cut just after the last complete tag before the cap, so
+                    # the parser doesn't see a half tag or half character
+                    cut = body.rfind(b'>', 0, MAX_HTML_BYTES)
+                    del body[cut + 1 if cut > 0 else MAX_HTML_BYTES:]
+                    break
 
-        return response.text, None
+            # Use the declared charset, otherwise assume UTF-8 (requests would
+            # fall back to ISO-8859-1 for text/html without a charset)
+            content_type = response.headers.get('Content-Type', '')
+            encoding = response.encoding if 'charset' in content_type.lower() else 'utf-8'
+
+        try:
+            return body.decode(encoding or 'utf-8', errors='replace'), None
+        except LookupError:  # Unknown charset name
+            return body.decode('utf-8', errors='replace'), None
 
     except requests.exceptions.Timeout:
         return None, 'Request timed out'
@@ -645,51 +1078,34 @@ def fetch_webpage(url: str) -> tuple:
         return None, f'Request failed: {str(e)}'
 
 
-@functions_framework.http
-def enrich_webpage(request):
-    """
-    Main Cloud Function entry point.
+def _gzip_response(handler):
+    """Gzip the JSON body when the client accepts it and it is worth it.
 
-    Expected JSON input:
-    {
-        "url": "https://example.com/article",
-        "options": {
-            "skip_ai": false,
-            "extract_code": true
-        }
-    }
+    compresslevel=1 gets most of the size win on this text-heavy JSON for a
+    fraction of the CPU of the default level.
     """
-    # Handle CORS
-    if request.method == 'OPTIONS':
-        headers = {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'POST',
-            'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Max-Age': '3600'
-        }
-        return ('', 204, headers)
-
-    headers = {'Access-Control-Allow-Origin': '*'}
-
+    @functools.wraps(handler)
+    def wrapper(request):
+        body, status, headers = handler(request)
+        if len(body) >= GZIP_MIN_BYTES and 'gzip' in request.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=1)
+            headers = {**headers, 'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'}
+        return body, status, headers
+    return wrapper
+
+
+def enrich_url(url: str, options: dict) -> tuple:
+    """Enrich a single URL. Returns (response, status_code)."""
     try:
-        request_json = request.get_json(silent=True)
-
-        if not request_json or 'url' not in request_json:
-            return (json.dumps({
-                'error': 'Missing required field: url'
-            }), 400, headers)
-
-        url = request_json['url']
-        options = request_json.get('options', {})
         skip_ai = options.get('skip_ai', False)
         extract_code = options.get('extract_code', True)
 
-        # Extract domain
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.replace('www.', '')
+        # Parse the URL once for the whole request
+        url_l = url.lower()
+        domain = urlparse(url_l).netloc.removeprefix('www.')
 
         # Special handling for Spotify podcast episodes - use Web API (with oEmbed fallback)
-        if 'spotify.com/episode' in url.lower():
+        if 'spotify.com/episode' in url_l:
             spotify_data = fetch_spotify_episode(url)
             if spotify_data.get('success'):
                 # Build content for AI analysis - much richer with Web API data
@@ -709,73 +1125,20 @@ def enrich_webpage(request):
 
                 content_for_ai = '\n'.join(content_parts)
 
+                # Start the RSS lookup + transcription chain in the background;
+                # it has no dependency on the AI analysis below
+                transcription_future = _TRANSCRIPTION_POOL.submit(transcribe_spotify_episode, spotify_data)
+
                 # Generate AI analysis with rich content
                 ai_result = {'title': spotify_data['title'], 'summary': None, 'analysis': None}
                 if not options.get('skip_ai', False) and GEMINI_API_KEY and content_for_ai:
-                    try:
-                        genai.configure(api_key=GEMINI_API_KEY)
-                        model = genai.GenerativeModel('gemini-2.0-flash')
-                        prompt = f"""Analyze this podcast episode:
-
-{content_for_ai}
-
-Platform: Spotify
-
-Provide:
-1. A 2-3 sentence summary of what this episode covers
-2. Key topics and who would find this useful
-
-Respond in this exact JSON format (both values must be plain text strings, not arrays or objects):
-{{"summary": "Your 2-3 sentence summary here", "analysis": "Key topics: topic1, topic2, topic3. Target audience: description of who would find this useful."}}"""
-                        response = model.generate_content(prompt)
-                        json_match = re.search(r'\{[\s\S]*\}', response.text.strip())
-                        if json_match:
-                            parsed = json.loads(json_match.group())
-                            ai_result['summary'] = parsed.get('summary')
-                            # Ensure analysis is a string
-                            analysis = parsed.get('analysis')
-                            if isinstance(analysis, dict):
-                                parts = []
-                                if 'key_topics' in analysis:
-                                    parts.append(f"Key topics: {', '.join(analysis['key_topics']) if isinstance(analysis['key_topics'], list) else analysis['key_topics']}")
-                                if 'target_audience' in analysis:
-                                    parts.append(f"Target audience: {', '.join(analysis['target_audience']) if isinstance(analysis['target_audience'], list) else analysis['target_audience']}")
-                                analysis = '. '.join(parts) if parts else str(analysis)
-                            ai_result['analysis'] = analysis
-                    except Exception as e:
-                        ai_result['error'] = str(e)
+                    ai_result.update(generate_podcast_analysis(content_for_ai))
 
                 # Use show name + publisher as author if available
                 author = spotify_data.get('publisher') or spotify_data.get('show_name') or spotify_data.get('provider_name', 'Spotify')
 
-                # Try to get transcription via RSS feed
-                transcription = None
-                transcription_error = None
-
-                if spotify_data.get('show_name') and spotify_data.get('title'):
-                    # Step 1: Find RSS feed via iTunes
-                    rss_result = search_podcast_itunes(spotify_data['show_name'])
-
-                    if rss_result.get('success') and rss_result.get('rss_url'):
-                        # Step 2: Find episode in RSS
-                        episode_result = find_episode_in_rss(
-                            rss_result['rss_url'],
-                            spotify_data['title'],
-                            spotify_data.get('duration_minutes')
-                        )
-
-                        if episode_result.get('success') and episode_result.get('audio_url'):
-                            # Step 3: Transcribe audio
-                            transcription_result = transcribe_audio_url(episode_result['audio_url'])
-
-                            if transcription_result.get('success'):
-                                transcription = transcription_result.get('text')
-                            else:
-                                transcription_error = f"Transcription failed: {transcription_result.get('error')}"
-                        else:
-                            transcription_error = f"Episode not found in RSS: {episode_result.get('error')}"
-                    else:
-                        transcription_error = f"RSS feed not found: {rss_result.get('error')}"
+                # Get transcription result (started before the AI analysis)
+                transcription, transcription_error = transcription_future.result()
 
                 response_data = {
                     'url': url,
@@ -792,7 +1155,7 @@ Respond in this exact JSON format (both values must be plain text strings, not a
                     'code_snippets': [],
                     'ai_summary': ai_result.get('summary'),
                     'ai_analysis': ai_result.get('analysis'),
-                    'processed_at': datetime.utcnow().isoformat() + 'Z',
+                    'processed_at': datetime.now(timezone.utc),
                     # Extra Spotify-specific fields
                     'show_name': spotify_data.get('show_name'),
                     'show_description': spotify_data.get('show_description'),
@@ -811,13 +1174,28 @@ Respond in this exact JSON format (both values must be plain text strings, not a
                 if errors:
                     response_data['errors'] = errors
 
-                return (json.dumps(response_data), 200, headers)
+                return response_data, 200
+
+        # Video hosts in OEMBED_ENDPOINTS: without AI analysis their oEmbed
+        # is everything we'd extract from the page, so skip the download and
+        # parse entirely
+        if skip_ai and any(host in domain for host in OEMBED_ENDPOINTS):
+            oembed_data = fetch_video_oembed(url, domain)
+            if oembed_data.get('success') and oembed_data['description']:
+                upload_date = oembed_data['upload_date']
+                response = dict(zip(_RESPONSE_KEYS, (
+                    url, domain, 'video', oembed_data['title'], oembed_data['author_name'],
+                    upload_date[:10] if upload_date else None,
+                    oembed_data['thumbnail_url'], oembed_data['description'], None, None, None, [], None, None,
+                    datetime.now(timezone.utc),
+                )))
+                return response, 200
 
         # Fetch the webpage
         html, fetch_error = fetch_webpage(url)
 
         if fetch_error:
-            return (json.dumps({
+            return {
                 'url': url,
                 'domain': domain,
                 'error': {
@@ -825,68 +1203,126 @@ Respond in this exact JSON format (both values must be plain text strings, not a
                     'message': fetch_error,
                     'recoverable': True
                 }
-            }), 200, headers)  # Return 200 with error in body per ARCHITECTURE.md
+            }, 200  # Return 200 with error in body per ARCHITECTURE.md
 
-        # Parse HTML
-        soup = BeautifulSoup(html, 'html.parser')
+        # Identical page + options -> reuse the previous enrichment (skips
+        # parsing and the AI call entirely)
+        cache_key = hashlib.sha256(f'{url}\n{skip_ai}\n{extract_code}\n{html}'.encode('utf-8')).hexdigest()
+        cached = _cache_get(_enrichment_cache, cache_key)
+        if cached:
+            return {**cached, 'processed_at': datetime.now(timezone.utc)}, 200
 
-        # Detect content type
-        content_type = detect_content_type(url, soup)
+        # Parse HTML once; every extractor queries the same lxml tree
+        tree = parse_html(html)
 
-        # Extract metadata
-        metadata = extract_metadata(url, soup)
+        # Detect content type
+        content_type = detect_content_type(url_l, tree, html, domain=domain)
 
-        # Extract main content
-        main_content = extract_main_content(soup)
+        # Extract main content (only needed for reading time and the AI prompt)
+        main_content, word_count = extract_main_content(tree) if (content_type == 'article' or not skip_ai) else (None, 0)
 
-        # Calculate reading time
-        reading_time = calculate_reading_time(main_content) if content_type == 'article' else None
+        # Start the AI analysis (includes cleaned title) in the background as
+        # soon as its inputs exist; the remaining extraction only touches the
+        # already-parsed tree
+        metas = collect_meta_tags(tree)
+        ai_future = None
+        if not skip_ai:
+            raw_title = extract_title(tree, metas)
+            ai_future = _AI_POOL.submit(generate_ai_analysis, url, raw_title, main_content, content_type)
 
-        # Extract price if product
-        price_info = extract_price(soup) if content_type == 'product' else {'price': None, 'currency': None}
+        # Extract metadata
+        metadata = extract_metadata(url, tree, metas)
 
-        # Extract code snippets if code resource
-        code_snippets = extract_code_snippets(soup) if (content_type == 'code' and extract_code) else []
+        # Type-specific fields: reading time, price, code snippets
+        extras = {'reading_time': None, 'price': None, 'currency': None, 'code_snippets': []}
+        type_extractor = _TYPE_EXTRACTORS.get(content_type)
+        if type_extractor:
+            extras.update(type_extractor(tree, word_count, extract_code))
 
-        # Generate AI analysis (includes cleaned title)
         ai_result = {'title': metadata['title'], 'summary': None, 'analysis': None, 'error': None}
-        if not skip_ai:
-            ai_result = generate_ai_analysis(url, metadata['title'], main_content, content_type)
+        if ai_future:
+            ai_result = ai_future.result()
 
         # Build response - use AI-cleaned title
-        response = {
-            'url': url,
-            'domain': domain,
-            'type': content_type,
-            'title': ai_result.get('title') or metadata['title'],
-            'author': metadata['author'],
-            'published_date': metadata['published_date'],
-            'main_image': metadata['main_image'],
-            'description': metadata['description'],
-            'reading_time': reading_time,
-            'price': price_info['price'],
-            'currency': price_info['currency'],
-            'code_snippets': code_snippets,
-            'ai_summary': ai_result['summary'],
-            'ai_analysis': ai_result['analysis'],
-            'processed_at': datetime.utcnow().isoformat() + 'Z',
-        }
-
-        # Include errors if any (partial success per ARCHITECTURE.md)
+        title = ai_result.get('title') or metadata['title']
+        response = dict(zip(_RESPONSE_KEYS, (
+            url, domain, content_type, title, metadata['author'], metadata['published_date'],
+            metadata['main_image'], metadata['description'], extras['reading_time'], extras['price'],
+            extras['currency'], extras['code_snippets'], ai_result['summary'], ai_result['analysis'],
+            datetime.now(timezone.utc),
+        )))
+
+        # Include errors if any (partial success per ARCHITECTURE.md);
+        # only complete results are cached
         if ai_result.get('error'):
             response['error'] = {
                 'stage': 'ai_analysis',
                 'message': ai_result['error'],
                 'recoverable': True
             }
+        else:
+            ttl = PRODUCT_ENRICHMENT_CACHE_TTL if content_type == 'product' else ENRICHMENT_CACHE_TTL
+            _cache_set(_enrichment_cache, cache_key, response, ttl)
 
-        return (json.dumps(response), 200, headers)
+        return response, 200
 
     except Exception as e:
-        return (json.dumps({
+        print(f"enrich_url processing error ({type(e).__name__}): {e}")
+        return {
             'error': {
                 'stage': 'processing',
                 'message': str(e),
                 'recoverable': False
             }
-        }), 500, headers)
+        }, 500
+
+
+@functions_framework.http
+@_gzip_response
+def enrich_webpage(request):
+    """
+    Main Cloud Function entry point.
+
+    Expected JSON input:
+    {
+        "url": "https://example.com/article",
+        "options": {
+            "skip_ai": false,
+            "extract_code": true
+        }
+    }
+
+    or, to enrich several pages in one call (same options for all), with
+    "urls": [...] instead of "url". The batch response is {"results": [...]},
+    one single-URL response per input URL, in order.
+    """
+    # Handle CORS
+    if request.method == 'OPTIONS':
+        return ('', 204, _PREFLIGHT_HEADERS)
+
+    headers = _RESPONSE_HEADERS
+
+    request_json = request.get_json(silent=True)
+    if not isinstance(request_json, dict):
+        return (_MISSING_URL_BODY, 400, headers)
+
+    options = request_json.get('options') or {}
+
+    if 'urls' in request_json:
+        urls = request_json['urls']
+        if (not isinstance(urls, list) or not 0 < len(urls) <= MAX_BATCH_URLS
+                or not all(u and isinstance(u, str) for u in urls)):
+            return (_INVALID_URLS_BODY, 400, headers)
+
+        # A pool per batch: enrich_url itself waits on _AI_POOL and
+        # _TRANSCRIPTION_POOL, so running batch items there could deadlock it
+        with ThreadPoolExecutor(max_workers=min(len(urls), BATCH_WORKERS)) as pool:
+            results = [response for response, _ in pool.map(lambda u: enrich_url(u, options), urls)]
+        return (orjson.dumps({'results': results}, option=_JSON_OPTIONS), 200, headers)
+
+    url = request_json.get('url')
+    if not url or not isinstance(url, str):
+        return (_MISSING_URL_BODY, 400, headers)
+
+    response, status = enrich_url(url, options)
+    return (orjson.dumps(response, option=_JSON_OPTIONS), status, headers)